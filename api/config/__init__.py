@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     cases_dir: str = "data/cases"
     max_file_size: int = 100 * 1024 * 1024
     chunk_size: int = 8192
+    parse_bufsize: int = 128 * 1024
     high_threat_threshold: float = 0.75
     medium_threat_threshold: float = 0.50
     low_threat_threshold: float = 0.25
@@ -2,12 +2,14 @@
 Suricata eve.json parser with streaming support for large files.
 Routes events by event_type (alert, flow, dns, http, tls, fileinfo).
 """
-import json
 import logging
 from pathlib import Path
 from typing import Iterator, Union, Any
 from datetime import datetime, timezone
 
+import orjson
+
+from api.parsers.stream import open_log_file
 from api.models.suricata import (
     SuricataAlert,
     SuricataFlow,
@@ -86,7 +88,8 @@ class SuricataParser:
     def parse_file(
         file_path: Union[str, Path],
         event_types: list[str] = None,
-        max_errors: int = 100
+        max_errors: int = 100,
+        buffer_size: int = None,
     ) -> Iterator[Union[SuricataAlert, SuricataFlow, SuricataDns, SuricataHttp, SuricataTls]]:
         """
         Parse a Suricata eve.json file line-by-line (streaming).
@@ -98,6 +101,7 @@ class SuricataParser:
             file_path: Path to the eve.json file
             event_types: List of event types to parse (None = all types)
             max_errors: Maximum number of parsing errors before stopping
+            buffer_size: Read buffer size in bytes (defaults to settings.parse_bufsize)
 
         Yields:
             Parsed Suricata events as Pydantic models
@@ -121,7 +125,7 @@ class SuricataParser:
         logger.info(f"Parsing Suricata eve.json: {file_path}")
 
         # Stream file line-by-line to handle large files
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open_log_file(file_path, buffer_size) as f:
             for line in f:
                 line_num += 1
                 line = line.strip()
@@ -132,7 +136,7 @@ class SuricataParser:
 
                 try:
                     # Parse JSON line
-                    data = json.loads(line)
+                    data = orjson.loads(line)
 
                     # Get event type
                     event_type = data.get("event_type")
@@ -158,7 +162,7 @@ class SuricataParser:
                     parsed_count += 1
                     yield entry
 
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     error_count += 1
                     logger.warning(
                         f"JSON decode error at {file_path}:{line_num}: {e}"
@@ -183,18 +187,18 @@ class SuricataParser:
         )
 
     @staticmethod
-    def parse_line(line: str) -> Union[SuricataAlert, SuricataFlow, SuricataDns, SuricataHttp, SuricataTls, None]:
+    def parse_line(line: Union[str, bytes]) -> Union[SuricataAlert, SuricataFlow, SuricataDns, SuricataHttp, SuricataTls, None]:
         """
         Parse a single JSON line from a Suricata eve.json log.
 
         Args:
-            line: JSON string containing a single log entry
+            line: JSON text (str or bytes) containing a single log entry
 
         Returns:
             Parsed Suricata event or None if parsing fails
         """
         try:
-            data = json.loads(line)
+            data = orjson.loads(line)
             event_type = data.get("event_type")
 
             if not event_type:
@@ -4,7 +4,7 @@ Provides a common Connection model with normalization functions.
 """
 from typing import Optional, Union, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 import logging
 
 from api.models.zeek import ConnLog, DnsLog, HttpLog
@@ -14,6 +14,16 @@ from api.parsers.suricata_parser import SuricataParser
 
 logger = logging.getLogger(__name__)
 
+# Numeric DNS response codes (as emitted by tshark) mapped to Zeek/Suricata names
+DNS_RCODE_NAMES = {
+    "0": "NOERROR",
+    "1": "FORMERR",
+    "2": "SERVFAIL",
+    "3": "NXDOMAIN",
+    "4": "NOTIMP",
+    "5": "REFUSED",
+}
+
 
 class Connection(BaseModel):
     """
@@ -40,6 +50,11 @@ class Connection(BaseModel):
     pkts_sent: Optional[int] = Field(None, description="Packets sent")
     pkts_recv: Optional[int] = Field(None, description="Packets received")
 
+    @property
+    def service_lc(self) -> str:
+        """Lowercased service name, "" when unknown (derived on each read, so it follows the field)."""
+        return self.service.lower() if self.service else ""
+
 
 class DnsQuery(BaseModel):
     """
@@ -57,6 +72,31 @@ class DnsQuery(BaseModel):
     answers: list[str] = Field(default_factory=list, description="DNS answers")
     source: str = Field(..., description="Log source (zeek/suricata)")
 
+    @property
+    def epoch(self) -> float:
+        """Query timestamp as POSIX seconds (derived on each read, so it follows the field)."""
+        return self.timestamp.timestamp()
+
+    @property
+    def query_lc(self) -> str:
+        """Lowercased query name (derived on each read, so it follows the field)."""
+        return self.query.lower()
+
+    @field_validator("qtype")
+    @classmethod
+    def _uppercase_qtype(cls, value: Optional[str]) -> Optional[str]:
+        """Canonicalize query type names to uppercase once at ingest."""
+        return value.upper() if value else value
+
+    @field_validator("rcode")
+    @classmethod
+    def _canonicalize_rcode(cls, value: Optional[str]) -> Optional[str]:
+        """Canonicalize response codes to uppercase names so analyzers can compare with ==."""
+        if not value:
+            return value
+        value = value.upper()
+        return DNS_RCODE_NAMES.get(value, value)
+
 
 class Alert(BaseModel):
     """
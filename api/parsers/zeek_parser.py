@@ -2,12 +2,14 @@
 Zeek JSON log parser with streaming support for large files.
 Handles all major Zeek log types with proper error handling.
 """
-import json
 import logging
 from pathlib import Path
 from typing import Iterator, Union, Any
 from datetime import datetime, timezone
 
+import orjson
+
+from api.parsers.stream import open_log_file
 from api.models.zeek import (
     ConnLog,
     DnsLog,
@@ -95,7 +97,8 @@ class ZeekParser:
     def parse_file(
         file_path: Union[str, Path],
         log_type: str = None,
-        max_errors: int = 100
+        max_errors: int = 100,
+        buffer_size: int = None,
     ) -> Iterator[Union[ConnLog, DnsLog, HttpLog, SslLog, X509Log, FilesLog, NoticeLog, WeirdLog, DpdLog, SmtpLog]]:
         """
         Parse a Zeek JSON log file line-by-line (streaming).
@@ -107,6 +110,7 @@ class ZeekParser:
             file_path: Path to the Zeek JSON log file
             log_type: Log type identifier (auto-detected if None)
             max_errors: Maximum number of parsing errors before stopping
+            buffer_size: Read buffer size in bytes (defaults to settings.parse_bufsize)
 
         Yields:
             Parsed Zeek log entries as Pydantic models
@@ -136,7 +140,7 @@ class ZeekParser:
         logger.info(f"Parsing Zeek {log_type} log: {file_path}")
 
         # Stream file line-by-line to handle large files
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open_log_file(file_path, buffer_size) as f:
             for line in f:
                 line_num += 1
                 line = line.strip()
@@ -147,7 +151,7 @@ class ZeekParser:
 
                 try:
                     # Parse JSON line
-                    data = json.loads(line)
+                    data = orjson.loads(line)
 
                     # Normalize Zeek dot-notation keys (e.g. id.orig_h -> id_orig_h)
                     data = {k.replace(".", "_"): v for k, v in data.items()}
@@ -156,7 +160,7 @@ class ZeekParser:
                     entry = model_class(**data)
                     yield entry
 
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     error_count += 1
                     logger.warning(
                         f"JSON decode error at {file_path}:{line_num}: {e}"
@@ -181,12 +185,12 @@ class ZeekParser:
         )
 
     @staticmethod
-    def parse_line(line: str, log_type: str) -> Union[ConnLog, DnsLog, HttpLog, SslLog, X509Log, FilesLog, NoticeLog, WeirdLog, DpdLog, SmtpLog, None]:
+    def parse_line(line: Union[str, bytes], log_type: str) -> Union[ConnLog, DnsLog, HttpLog, SslLog, X509Log, FilesLog, NoticeLog, WeirdLog, DpdLog, SmtpLog, None]:
         """
         Parse a single JSON line from a Zeek log.
 
         Args:
-            line: JSON string containing a single log entry
+            line: JSON text (str or bytes) containing a single log entry
             log_type: Type of log entry (conn, dns, http, etc.)
 
         Returns:
@@ -199,7 +203,7 @@ class ZeekParser:
         model_class = ZeekParser.LOG_TYPE_MODELS[log_type]
 
         try:
-            data = json.loads(line)
+            data = orjson.loads(line)
             data = {k.replace(".", "_"): v for k, v in data.items()}
             return model_class(**data)
         except Exception as e:
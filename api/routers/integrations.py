@@ -167,31 +167,33 @@ async def enrich_case_iocs_with_misp(
     enrichments = []
     total_hits = 0
 
-    for ioc in iocs:
-        value = str(ioc.get("value", "")).strip()
-        if not value:
-            continue
-
-        try:
-            payload = client.search_attribute(value, limit=limit_per_ioc)
-            hit_count, hit_items = normalize_misp_hits(payload)
-        except RuntimeError as e:
-            raise HTTPException(status_code=502, detail=str(e)) from e
-
-        if hit_count > 0:
-            total_hits += hit_count
-            enrichments.append(
-                {
-                    "ioc": {
-                        "id": ioc.get("id"),
-                        "type": ioc.get("type"),
-                        "value": value,
-                        "verdict": ioc.get("verdict"),
-                    },
-                    "hit_count": hit_count,
-                    "sample_hits": hit_items[:5],
-                }
-            )
+    # One client for the whole case so lookups share pooled keep-alive connections
+    with client:
+        for ioc in iocs:
+            value = str(ioc.get("value", "")).strip()
+            if not value:
+                continue
+
+            try:
+                payload = client.search_attribute(value, limit=limit_per_ioc)
+                hit_count, hit_items = normalize_misp_hits(payload)
+            except RuntimeError as e:
+                raise HTTPException(status_code=502, detail=str(e)) from e
+
+            if hit_count > 0:
+                total_hits += hit_count
+                enrichments.append(
+                    {
+                        "ioc": {
+                            "id": ioc.get("id"),
+                            "type": ioc.get("type"),
+                            "value": value,
+                            "verdict": ioc.get("verdict"),
+                        },
+                        "hit_count": hit_count,
+                        "sample_hits": hit_items[:5],
+                    }
+                )
 
     return {
         "status": "ok",
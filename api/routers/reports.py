@@ -4,7 +4,7 @@ Report Generation Router - Threat assessment reports in JSON and HTML.
 import io
 from datetime import datetime
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse, FileResponse
 
 from api.services.log_store import log_store
 from api.services.report_generator import ReportGenerator
@@ -22,7 +22,7 @@ async def report_json():
     """Generate a JSON threat assessment report."""
     _ensure_data_available()
     generator = ReportGenerator(log_store)
-    return generator.generate_json()
+    return Response(content=generator.generate_bytes(), media_type="application/json")
 
 
 @router.get("/html")
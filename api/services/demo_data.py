@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 import hashlib
-import json
+
+import orjson
 
 from api.services.log_store import LogStore
+from api.parsers.stream import open_log_file
 from api.parsers.zeek_parser import ZeekParser
 from api.parsers.unified import normalize_zeek_conn, normalize_zeek_dns
 
@@ -50,21 +52,23 @@ class DemoDataService:
 
     def read_json_lines(self, filename: str) -> list[dict[str, Any]]:
         """Read a JSON-lines Zeek-style log file from demo data."""
+        return list(self.iter_json_lines(filename))
+
+    def iter_json_lines(self, filename: str) -> Iterator[dict[str, Any]]:
+        """Stream rows from a JSON-lines demo log, skipping blank and malformed lines."""
         path = self.data_dir / filename
         if not path.exists():
-            return []
+            return
 
-        rows: list[dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as f:
+        with open_log_file(path) as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    rows.append(json.loads(line))
-                except json.JSONDecodeError:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
-        return rows
 
     @staticmethod
     def synthetic_payload(uid: str, max_bytes: int = 4096) -> dict[str, Any]:
@@ -2,7 +2,8 @@
 DNS threat analysis service for detecting tunneling, DGA domains, and suspicious patterns.
 Analyzes DNS queries to identify C2 channels and data exfiltration via DNS.
 """
-from typing import Optional
+from typing import Iterable, Optional
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, Counter
 from datetime import datetime
 import logging
@@ -53,6 +54,26 @@ class DnsAnalyzer:
         'xyz', 'top', 'win', 'bid', 'loan',  # Commonly abused
     }
 
+    # Query types seen in ordinary resolver traffic (qtype is uppercased by DnsQuery)
+    COMMON_QTYPES = frozenset({'A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS', 'PTR'})
+
+    # Query types not worth flagging as reconnaissance (TXT is scored separately)
+    STANDARD_QTYPES = frozenset({'A', 'AAAA', 'CNAME', 'MX', 'PTR', 'NS'})
+
+    # Dotted-quad IPv4 answer (CNAME/IPv6 answers are ignored for fast-flux)
+    IPV4_PATTERN = re.compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')
+
+    # Fast-flux score tiers: bisect a component's value into its thresholds
+    # to index the matching points (TTL tiers are upper bounds, lower is worse)
+    FLUX_IP_TIERS = (5, 10, 20)
+    FLUX_IP_SCORES = (10.0, 20.0, 30.0, 40.0)
+    FLUX_RATE_TIERS = (1.0, 2.0, 5.0)
+    FLUX_RATE_SCORES = (5.0, 15.0, 25.0, 30.0)
+    FLUX_TTL_TIERS = (300, 600, 1800)
+    FLUX_TTL_SCORES = (20.0, 15.0, 10.0, 0.0)
+    FLUX_PERIOD_TIERS = (4, 12, 24)
+    FLUX_PERIOD_SCORES = (2.0, 5.0, 7.0, 10.0)
+
     def __init__(
         self,
         tunneling_threshold: float = 60.0,
@@ -82,40 +103,64 @@ class DnsAnalyzer:
 
     def analyze_dns_threats(
         self,
-        dns_queries: list[DnsQuery],
+        dns_queries: Iterable[DnsQuery],
     ) -> DnsThreatSummary:
         """
         Perform comprehensive DNS threat analysis on all queries.
 
+        Queries are consumed in a single pass that builds the groupings every
+        detector needs, so any iterable (e.g. a generator over a large log)
+        can be analyzed without materializing it first.
+
         Args:
-            dns_queries: List of DNS queries to analyze
+            dns_queries: Iterable of DNS queries to analyze
 
         Returns:
             DnsThreatSummary with all detected threats
         """
-        logger.info(f"Analyzing {len(dns_queries)} DNS queries for threats")
-
         analysis_start = datetime.now().timestamp()
 
+        # Build the groupings for all detectors in one pass over the queries
+        tunneling_groups = defaultdict(list)
+        domain_groups = defaultdict(list)
+        domain_answers = defaultdict(list)
+        ip_groups = defaultdict(list)
+        total_queries = 0
+        data_start = None
+        data_end = None
+
+        for query in dns_queries:
+            total_queries += 1
+            ts = query.epoch
+            if data_start is None or ts < data_start:
+                data_start = ts
+            if data_end is None or ts > data_end:
+                data_end = ts
+
+            src_ip = query.src_ip
+            domain = query.query_lc
+            tunneling_groups[(src_ip, self._extract_base_domain(query.query))].append(query)
+            domain_groups[(src_ip, domain)].append(query)
+            ip_groups[src_ip].append(query)
+            for answer in query.answers:
+                domain_answers[domain].append({
+                    'timestamp': ts,
+                    'answer': answer,
+                    'src_ip': src_ip,
+                })
+
+        logger.info(f"Analyzing {total_queries} DNS queries for threats")
+
         # Detect various threat types
-        tunneling_results = self.detect_dns_tunneling(dns_queries)
-        dga_results = self.detect_dga_domains(dns_queries)
-        fast_flux_results = self.detect_fast_flux(dns_queries)
-        pattern_results = self.detect_suspicious_patterns(dns_queries)
+        tunneling_results = self._score_tunneling_groups(tunneling_groups)
+        dga_results = self._score_dga_groups(domain_groups)
+        fast_flux_results = self._score_fast_flux_groups(domain_answers)
+        pattern_results = self._score_suspicious_patterns(ip_groups, domain_groups)
 
         analysis_end = datetime.now().timestamp()
 
-        # Get data time range
-        if dns_queries:
-            timestamps = [q.timestamp.timestamp() for q in dns_queries]
-            data_start = min(timestamps)
-            data_end = max(timestamps)
-        else:
-            data_start = None
-            data_end = None
-
         summary = DnsThreatSummary(
-            total_queries_analyzed=len(dns_queries),
+            total_queries_analyzed=total_queries,
             tunneling_detections=len(tunneling_results),
             dga_detections=len(dga_results),
             fast_flux_detections=len(fast_flux_results),
@@ -140,27 +185,108 @@ class DnsAnalyzer:
 
     def detect_dns_tunneling(
         self,
-        dns_queries: list[DnsQuery],
+        dns_queries: Iterable[DnsQuery],
     ) -> list[DnsTunnelingResult]:
         """
         Detect DNS tunneling based on subdomain entropy and query patterns.
 
         Args:
-            dns_queries: List of DNS queries
+            dns_queries: Iterable of DNS queries
 
         Returns:
             List of tunneling detections sorted by score
         """
         # Group queries by (src_ip, base_domain)
-        query_groups = self._group_queries_by_domain(dns_queries)
+        return self._score_tunneling_groups(self._group_queries_by_domain(dns_queries))
 
+    def detect_dga_domains(
+        self,
+        dns_queries: Iterable[DnsQuery],
+    ) -> list[DgaResult]:
+        """
+        Detect DGA (Domain Generation Algorithm) domains using lexical analysis.
+
+        Args:
+            dns_queries: Iterable of DNS queries
+
+        Returns:
+            List of DGA detections sorted by score
+        """
+        # Group queries by (src_ip, domain)
+        return self._score_dga_groups(self._group_queries_by_fqdn(dns_queries))
+
+    def detect_fast_flux(
+        self,
+        dns_queries: Iterable[DnsQuery],
+    ) -> list[DnsFastFluxResult]:
+        """
+        Detect fast-flux DNS based on rapidly changing IP addresses.
+
+        Args:
+            dns_queries: Iterable of DNS queries
+
+        Returns:
+            List of fast-flux detections sorted by score
+        """
+        # Group queries by domain and track answers
+        domain_answers = defaultdict(list)
+
+        for query in dns_queries:
+            if query.answers:
+                # One conversion per query, shared by all of its answers
+                epoch = query.epoch
+                for answer in query.answers:
+                    domain_answers[query.query_lc].append({
+                        'timestamp': epoch,
+                        'answer': answer,
+                        'src_ip': query.src_ip,
+                    })
+
+        return self._score_fast_flux_groups(domain_answers)
+
+    def detect_suspicious_patterns(
+        self,
+        dns_queries: Iterable[DnsQuery],
+    ) -> list[SuspiciousDnsPattern]:
+        """
+        Detect other suspicious DNS patterns.
+
+        Args:
+            dns_queries: Iterable of DNS queries
+
+        Returns:
+            List of suspicious pattern detections
+        """
+        ip_groups = defaultdict(list)
+        domain_groups = defaultdict(list)
+        for query in dns_queries:
+            ip_groups[query.src_ip].append(query)
+            domain_groups[(query.src_ip, query.query_lc)].append(query)
+
+        return self._score_suspicious_patterns(ip_groups, domain_groups)
+
+    def _score_tunneling_groups(
+        self,
+        query_groups: dict[tuple[str, str], list[DnsQuery]],
+    ) -> list[DnsTunnelingResult]:
+        """
+        Score (src_ip, base_domain) query groups for tunneling.
+
+        Args:
+            query_groups: Mapping of (src_ip, base_domain) to queries
+
+        Returns:
+            List of tunneling detections sorted by score
+        """
         results = []
 
         for (src_ip, base_domain), queries in query_groups.items():
             if len(queries) < self.min_queries_tunneling:
                 continue
 
-            result = self._analyze_tunneling_pattern(src_ip, base_domain, queries)
+            result = self._analyze_tunneling_pattern(
+                src_ip, base_domain, queries, min_score=self.tunneling_threshold
+            )
             if result and result.tunneling_score >= self.tunneling_threshold:
                 results.append(result)
 
@@ -168,32 +294,26 @@ class DnsAnalyzer:
         results.sort(key=lambda r: r.tunneling_score, reverse=True)
         return results
 
-    def detect_dga_domains(
+    def _score_dga_groups(
         self,
-        dns_queries: list[DnsQuery],
+        domain_groups: dict[tuple[str, str], list[DnsQuery]],
     ) -> list[DgaResult]:
         """
-        Detect DGA (Domain Generation Algorithm) domains using lexical analysis.
+        Score (src_ip, domain) query groups for DGA characteristics.
 
         Args:
-            dns_queries: List of DNS queries
+            domain_groups: Mapping of (src_ip, lowercased domain) to queries
 
         Returns:
             List of DGA detections sorted by score
         """
-        # Group queries by (src_ip, domain)
-        domain_groups = defaultdict(list)
-        for query in dns_queries:
-            key = (query.src_ip, query.query.lower())
-            domain_groups[key].append(query)
-
         results = []
 
         for (src_ip, domain), queries in domain_groups.items():
             if len(queries) < self.min_queries_dga:
                 continue
 
-            result = self._analyze_dga_domain(src_ip, domain, queries)
+            result = self._analyze_dga_domain(src_ip, domain, queries, min_score=self.dga_threshold)
             if result and result.dga_score >= self.dga_threshold:
                 results.append(result)
 
@@ -201,38 +321,28 @@ class DnsAnalyzer:
         results.sort(key=lambda r: r.dga_score, reverse=True)
         return results
 
-    def detect_fast_flux(
+    def _score_fast_flux_groups(
         self,
-        dns_queries: list[DnsQuery],
+        domain_answers: dict[str, list[dict]],
     ) -> list[DnsFastFluxResult]:
         """
-        Detect fast-flux DNS based on rapidly changing IP addresses.
+        Score per-domain answer lists for fast-flux behavior.
 
         Args:
-            dns_queries: List of DNS queries
+            domain_answers: Mapping of lowercased domain to answer records
 
         Returns:
             List of fast-flux detections sorted by score
         """
-        # Group queries by domain and track answers
-        domain_answers = defaultdict(list)
-
-        for query in dns_queries:
-            if query.answers:
-                for answer in query.answers:
-                    domain_answers[query.query.lower()].append({
-                        'timestamp': query.timestamp.timestamp(),
-                        'answer': answer,
-                        'src_ip': query.src_ip,
-                    })
-
         results = []
 
         for domain, answer_list in domain_answers.items():
             if len(answer_list) < self.min_queries_fast_flux:
                 continue
 
-            result = self._analyze_fast_flux_domain(domain, answer_list)
+            result = self._analyze_fast_flux_domain(
+                domain, answer_list, min_score=self.fast_flux_threshold
+            )
             if result and result.fast_flux_score >= self.fast_flux_threshold:
                 results.append(result)
 
@@ -240,31 +350,36 @@ class DnsAnalyzer:
         results.sort(key=lambda r: r.fast_flux_score, reverse=True)
         return results
 
-    def detect_suspicious_patterns(
+    def _score_suspicious_patterns(
         self,
-        dns_queries: list[DnsQuery],
+        ip_groups: dict[str, list[DnsQuery]],
+        domain_groups: dict[tuple[str, str], list[DnsQuery]],
     ) -> list[SuspiciousDnsPattern]:
         """
-        Detect other suspicious DNS patterns.
+        Run the suspicious pattern detectors over pre-grouped queries.
 
         Args:
-            dns_queries: List of DNS queries
+            ip_groups: Mapping of src_ip to queries
+            domain_groups: Mapping of (src_ip, lowercased domain) to queries
 
         Returns:
-            List of suspicious pattern detections
+            List of suspicious pattern detections sorted by score
         """
         results = []
 
+        # Per-host aggregates shared by the NXDOMAIN and query-type detectors
+        host_stats = self._aggregate_host_queries(ip_groups)
+
         # Pattern 1: Excessive NXDOMAIN responses
-        nxdomain_patterns = self._detect_excessive_nxdomain(dns_queries)
+        nxdomain_patterns = self._detect_excessive_nxdomain(host_stats)
         results.extend(nxdomain_patterns)
 
         # Pattern 2: Unusual query types
-        unusual_query_patterns = self._detect_unusual_query_types(dns_queries)
+        unusual_query_patterns = self._detect_unusual_query_types(host_stats)
         results.extend(unusual_query_patterns)
 
         # Pattern 3: High query rate to single domain
-        high_rate_patterns = self._detect_high_query_rate(dns_queries)
+        high_rate_patterns = self._detect_high_query_rate(domain_groups)
         results.extend(high_rate_patterns)
 
         # Sort by score
@@ -273,14 +388,14 @@ class DnsAnalyzer:
 
     def _group_queries_by_domain(
         self,
-        queries: list[DnsQuery],
+        queries: Iterable[DnsQuery],
     ) -> dict[tuple[str, str], list[DnsQuery]]:
         """
         Group queries by (src_ip, base_domain).
         Extracts base domain from full query (removes subdomain).
 
         Args:
-            queries: List of DNS queries
+            queries: Iterable of DNS queries
 
         Returns:
             Dictionary mapping (src_ip, base_domain) to query list
@@ -294,6 +409,27 @@ class DnsAnalyzer:
 
         return groups
 
+    def _group_queries_by_fqdn(
+        self,
+        queries: Iterable[DnsQuery],
+    ) -> dict[tuple[str, str], list[DnsQuery]]:
+        """
+        Group queries by (src_ip, full lowercased domain).
+
+        Args:
+            queries: Iterable of DNS queries
+
+        Returns:
+            Dictionary mapping (src_ip, domain) to query list
+        """
+        groups = defaultdict(list)
+
+        for query in queries:
+            key = (query.src_ip, query.query_lc)
+            groups[key].append(query)
+
+        return groups
+
     def _extract_base_domain(self, fqdn: str) -> str:
         """
         Extract base domain from FQDN.
@@ -318,6 +454,7 @@ class DnsAnalyzer:
         src_ip: str,
         base_domain: str,
         queries: list[DnsQuery],
+        min_score: float = 0.0,
     ) -> Optional[DnsTunnelingResult]:
         """
         Analyze queries for DNS tunneling indicators.
@@ -326,6 +463,7 @@ class DnsAnalyzer:
             src_ip: Source IP
             base_domain: Base domain
             queries: List of queries to this domain
+            min_score: Skip entropy analysis when the group cannot reach this score
 
         Returns:
             DnsTunnelingResult if tunneling detected, None otherwise
@@ -333,33 +471,55 @@ class DnsAnalyzer:
         # Extract subdomains
         subdomains = []
         for query in queries:
-            subdomain = query.query.lower().rstrip('.').replace(f'.{base_domain}', '')
+            subdomain = query.query_lc.rstrip('.').replace(f'.{base_domain}', '')
             if subdomain and subdomain != base_domain:
                 subdomains.append(subdomain)
 
         if not subdomains:
             return None
 
-        # Calculate entropy for each subdomain
-        entropies = [self._calculate_entropy(s) for s in subdomains]
-        avg_entropy = statistics.mean(entropies)
-        max_entropy = max(entropies)
-
         # Calculate subdomain lengths
         lengths = [len(s) for s in subdomains]
-        avg_length = statistics.mean(lengths)
+        avg_length = statistics.fmean(lengths)
         max_length = max(lengths)
+        distinct_subdomains = set(subdomains)
+        unique_subdomains = len(distinct_subdomains)
 
-        # Count query types
-        txt_count = sum(1 for q in queries if q.qtype and 'TXT' in q.qtype.upper())
-        nxdomain_count = sum(1 for q in queries if q.rcode and 'NXDOMAIN' in q.rcode.upper())
-
-        # Count unusual query types
-        unusual_qtypes = []
+        # Count query types, NXDOMAINs and unusual query types in one pass
+        txt_count = 0
+        nxdomain_count = 0
+        unusual_qtypes = {}  # insertion-ordered set
         for query in queries:
-            if query.qtype and query.qtype.upper() not in {'A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS', 'PTR'}:
-                if query.qtype not in unusual_qtypes:
-                    unusual_qtypes.append(query.qtype)
+            qtype = query.qtype
+            if qtype == 'TXT':
+                txt_count += 1
+            elif qtype and qtype not in self.COMMON_QTYPES:
+                unusual_qtypes[qtype] = None
+            if query.rcode == 'NXDOMAIN':
+                nxdomain_count += 1
+
+        # Entropy is the only costly feature; bail out if even its maximum
+        # contribution cannot lift the group to min_score
+        if min_score > 0.0:
+            upper_bound, _, _ = self._calculate_tunneling_score(
+                query_count=len(queries),
+                unique_subdomains=unique_subdomains,
+                avg_entropy=4.0,
+                max_entropy=4.0,
+                avg_length=avg_length,
+                max_length=max_length,
+                txt_count=txt_count,
+                nxdomain_count=nxdomain_count,
+                unusual_qtype_count=len(unusual_qtypes),
+            )
+            if upper_bound < min_score:
+                return None
+
+        # Calculate entropy once per distinct subdomain (repeats are common)
+        entropy_by_subdomain = {s: self._calculate_entropy(s) for s in distinct_subdomains}
+        entropies = [entropy_by_subdomain[s] for s in subdomains]
+        avg_entropy = statistics.fmean(entropies)
+        max_entropy = max(entropies)
 
         # Estimate data exfiltrated (rough estimate based on subdomain content)
         estimated_bytes = sum(len(s) * 0.75 for s in subdomains)  # Assume ~75% efficiency
@@ -367,7 +527,7 @@ class DnsAnalyzer:
         # Calculate score
         score, confidence, reasons = self._calculate_tunneling_score(
             query_count=len(queries),
-            unique_subdomains=len(set(subdomains)),
+            unique_subdomains=unique_subdomains,
             avg_entropy=avg_entropy,
             max_entropy=max_entropy,
             avg_length=avg_length,
@@ -378,9 +538,7 @@ class DnsAnalyzer:
         )
 
         # Get timestamps
-        timestamps = [q.timestamp.timestamp() for q in queries]
-        first_seen = min(timestamps)
-        last_seen = max(timestamps)
+        first_seen, last_seen = self._time_bounds(queries)
         time_span = last_seen - first_seen
 
         # MITRE mapping
@@ -390,18 +548,19 @@ class DnsAnalyzer:
         if score >= 80:
             mitre_techniques.append('T1041')  # Exfiltration Over C2 Channel
 
-        result = DnsTunnelingResult(
+        # Internally computed values are already well-typed; skip validation
+        result = DnsTunnelingResult.model_construct(
             domain=base_domain,
             src_ip=src_ip,
             query_count=len(queries),
-            unique_subdomains=len(set(subdomains)),
+            unique_subdomains=unique_subdomains,
             avg_subdomain_entropy=avg_entropy,
             max_subdomain_entropy=max_entropy,
             avg_subdomain_length=avg_length,
             max_subdomain_length=max_length,
             txt_record_queries=txt_count,
             nxdomain_responses=nxdomain_count,
-            unusual_query_types=unusual_qtypes,
+            unusual_query_types=list(unusual_qtypes),
             estimated_bytes_exfiltrated=int(estimated_bytes),
             tunneling_score=score,
             confidence=confidence,
@@ -559,6 +718,7 @@ class DnsAnalyzer:
         src_ip: str,
         domain: str,
         queries: list[DnsQuery],
+        min_score: float = 0.0,
     ) -> Optional[DgaResult]:
         """
         Analyze domain for DGA characteristics using lexical analysis.
@@ -567,6 +727,8 @@ class DnsAnalyzer:
             src_ip: Source IP
             domain: Domain name to analyze
             queries: Queries to this domain
+            min_score: Skip the lexical features and word-part matching when the
+                domain cannot reach this score
 
         Returns:
             DgaResult if DGA detected, None otherwise
@@ -583,20 +745,62 @@ class DnsAnalyzer:
         if len(domain_name) < 6:
             return None
 
-        # Calculate lexical features
-        entropy = self._calculate_entropy(domain_name)
-        consonant_ratio = self._calculate_consonant_ratio(domain_name)
-        digit_ratio = self._calculate_digit_ratio(domain_name)
-        bigram_score = self._calculate_bigram_score(domain_name)
-        meaningful_parts = self._count_meaningful_parts(domain_name)
-
         # TLD analysis
         tld_common = tld in self.COMMON_TLDS
         tld_suspicious = tld in self.SUSPICIOUS_TLDS
 
-        # Count response types
-        nxdomain_count = sum(1 for q in queries if q.rcode and 'NXDOMAIN' in q.rcode.upper())
-        success_count = sum(1 for q in queries if q.rcode and q.rcode.upper() in {'NOERROR', 'SUCCESS'})
+        # Count response types in one pass
+        nxdomain_count = 0
+        success_count = 0
+        for query in queries:
+            rcode = query.rcode
+            if rcode == 'NXDOMAIN':
+                nxdomain_count += 1
+            elif rcode == 'NOERROR' or rcode == 'SUCCESS':
+                success_count += 1
+
+        # Entropy, bigram and word-part scoring are the costly features. Bound the
+        # score with the cheap ones (TLD, NXDOMAIN rate, character ratios) and those
+        # three at their maximum: Shannon entropy never exceeds log2 of the number of
+        # distinct characters, a bigram score of 0 and no word parts score highest.
+        if min_score > 0.0:
+            upper_bound, _, _ = self._calculate_dga_score(
+                domain_name=domain_name,
+                entropy=math.log2(len(set(domain_name.lower()))),
+                consonant_ratio=self._calculate_consonant_ratio(domain_name),
+                digit_ratio=self._calculate_digit_ratio(domain_name),
+                bigram_score=0.0,
+                meaningful_parts=0,
+                tld_common=tld_common,
+                tld_suspicious=tld_suspicious,
+                nxdomain_count=nxdomain_count,
+                query_count=len(queries),
+            )
+            if upper_bound < min_score:
+                return None
+
+        # Calculate lexical features
+        entropy, bigram_score, consonant_ratio, digit_ratio = self._calculate_lexical_features(domain_name)
+
+        # Word-part matching is the costliest remaining feature; bail out if
+        # even its maximum contribution cannot lift the domain to min_score
+        if min_score > 0.0:
+            upper_bound, _, _ = self._calculate_dga_score(
+                domain_name=domain_name,
+                entropy=entropy,
+                consonant_ratio=consonant_ratio,
+                digit_ratio=digit_ratio,
+                bigram_score=bigram_score,
+                meaningful_parts=0,
+                tld_common=tld_common,
+                tld_suspicious=tld_suspicious,
+                nxdomain_count=nxdomain_count,
+                query_count=len(queries),
+            )
+            if upper_bound < min_score:
+                return None
+
+        meaningful_parts = self._count_meaningful_parts(domain_name)
 
         # Calculate DGA score
         score, confidence, reasons = self._calculate_dga_score(
@@ -613,16 +817,15 @@ class DnsAnalyzer:
         )
 
         # Get timestamps
-        timestamps = [q.timestamp.timestamp() for q in queries]
-        first_seen = min(timestamps)
-        last_seen = max(timestamps)
+        first_seen, last_seen = self._time_bounds(queries)
 
         # MITRE mapping
         mitre_techniques = ['T1071.004']  # Application Layer Protocol: DNS
         if score >= 80:
             mitre_techniques.append('T1568.002')  # Dynamic Resolution: Domain Generation Algorithms
 
-        result = DgaResult(
+        # Internally computed values are already well-typed; skip validation
+        result = DgaResult.model_construct(
             domain=domain,
             src_ip=src_ip,
             domain_entropy=entropy,
@@ -645,6 +848,26 @@ class DnsAnalyzer:
 
         return result
 
+    def _time_bounds(self, queries: list[DnsQuery]) -> tuple[float, float]:
+        """
+        Get the earliest and latest query timestamps in a single pass.
+
+        Args:
+            queries: Non-empty list of DNS queries
+
+        Returns:
+            Tuple of (first_seen, last_seen)
+        """
+        first_seen = math.inf
+        last_seen = -math.inf
+        for query in queries:
+            ts = query.epoch
+            if ts < first_seen:
+                first_seen = ts
+            if ts > last_seen:
+                last_seen = ts
+        return first_seen, last_seen
+
     def _calculate_entropy(self, s: str) -> float:
         """
         Calculate Shannon entropy of a string.
@@ -658,18 +881,71 @@ class DnsAnalyzer:
         if not s:
             return 0.0
 
-        # Count character frequencies
-        counter = Counter(s.lower())
+        # Count character frequencies (Counter tallies in C; ASCII labels are
+        # counted as bytes to skip building one-character str objects)
+        s_lower = s.lower()
+        counts = Counter(s_lower.encode('ascii') if s_lower.isascii() else s_lower).values()
         length = len(s)
 
         # Calculate entropy
         entropy = 0.0
-        for count in counter.values():
+        for count in counts:
             p = count / length
             entropy -= p * math.log2(p)
 
         return entropy
 
+    def _calculate_lexical_features(self, s: str) -> tuple[float, float, float, float]:
+        """
+        Calculate entropy, bigram score, consonant ratio and digit ratio together.
+        Equivalent to calling the individual helpers, but walks the string once
+        for the character-class and bigram features instead of four times.
+
+        Args:
+            s: Input string
+
+        Returns:
+            Tuple of (entropy, bigram_score, consonant_ratio, digit_ratio)
+        """
+        if not s:
+            return 0.0, 0.0, 10.0, 0.0
+
+        s_lower = s.lower()
+        bigrams = self.COMMON_BIGRAMS
+        vowel_count = 0
+        consonant_count = 0
+        digit_count = 0
+        bigram_total = 0.0
+        bigram_count = 0
+        prev = ''
+
+        for c in s_lower:
+            if c.isalpha():
+                if c in 'aeiou':
+                    vowel_count += 1
+                else:
+                    consonant_count += 1
+                if prev:
+                    bigram_total += bigrams.get(prev + c, 0.0)
+                    bigram_count += 1
+                prev = c
+            else:
+                if c.isdigit():
+                    digit_count += 1
+                prev = ''
+
+        entropy = self._calculate_entropy(s)
+
+        if bigram_count:
+            bigram_score = min(100.0, ((bigram_total / bigram_count) / 15.0) * 100.0)
+        else:
+            bigram_score = 0.0
+
+        consonant_ratio = consonant_count / vowel_count if vowel_count else 10.0
+        digit_ratio = digit_count / len(s)
+
+        return entropy, bigram_score, consonant_ratio, digit_ratio
+
     def _calculate_consonant_ratio(self, s: str) -> float:
         """
         Calculate ratio of consonants to vowels.
@@ -680,15 +956,15 @@ class DnsAnalyzer:
         Returns:
             Consonant ratio (higher = less English-like)
         """
-        vowels = set('aeiou')
         s_lower = s.lower()
 
-        vowel_count = sum(1 for c in s_lower if c in vowels)
-        consonant_count = sum(1 for c in s_lower if c.isalpha() and c not in vowels)
-
+        # Count with C-level str methods; vowels are letters, so the rest of the
+        # letters are consonants
+        vowel_count = sum(map(s_lower.count, 'aeiou'))
         if vowel_count == 0:
             return 10.0  # Very high ratio if no vowels
 
+        consonant_count = sum(map(str.isalpha, s_lower)) - vowel_count
         return consonant_count / vowel_count
 
     def _calculate_digit_ratio(self, s: str) -> float:
@@ -704,7 +980,7 @@ class DnsAnalyzer:
         if not s:
             return 0.0
 
-        digit_count = sum(1 for c in s if c.isdigit())
+        digit_count = sum(map(str.isdigit, s))
         return digit_count / len(s)
 
     def _calculate_bigram_score(self, s: str) -> float:
@@ -899,6 +1175,7 @@ class DnsAnalyzer:
         self,
         domain: str,
         answer_list: list[dict],
+        min_score: float = 0.0,
     ) -> Optional[DnsFastFluxResult]:
         """
         Analyze domain for fast-flux characteristics.
@@ -906,26 +1183,32 @@ class DnsAnalyzer:
         Args:
             domain: Domain name
             answer_list: List of DNS answers with timestamps
+            min_score: Skip building a result for domains scoring below this
 
         Returns:
             DnsFastFluxResult if fast-flux detected, None otherwise
         """
-        # Extract unique IPs
-        ip_pattern = re.compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')
+        # Extract unique IPs and time bounds in a single pass
+        ip_pattern = self.IPV4_PATTERN
         unique_ips = set()
+        first_seen = math.inf
+        last_seen = -math.inf
 
         for answer_data in answer_list:
+            ts = answer_data['timestamp']
+            if ts < first_seen:
+                first_seen = ts
+            if ts > last_seen:
+                last_seen = ts
             answer = answer_data['answer']
-            if ip_pattern.match(answer):
+            # Cheap dot count rules out CNAMEs and IPv6 before the regex runs
+            if answer.count('.') == 3 and ip_pattern.match(answer):
                 unique_ips.add(answer)
 
         if len(unique_ips) < 3:
             return None
 
         # Calculate time span
-        timestamps = [a['timestamp'] for a in answer_list]
-        first_seen = min(timestamps)
-        last_seen = max(timestamps)
         time_span = last_seen - first_seen
 
         if time_span < 3600:  # Less than 1 hour
@@ -949,6 +1232,9 @@ class DnsAnalyzer:
             time_span_hours=time_span_hours,
         )
 
+        if score < min_score:
+            return None
+
         # MITRE mapping
         mitre_techniques = ['T1071.004']  # Application Layer Protocol: DNS
         if score >= 80:
@@ -989,111 +1275,142 @@ class DnsAnalyzer:
         Returns:
             Tuple of (score, confidence, reasons)
         """
-        score = 0.0
-        confidence = 0.0
         reasons = []
 
         # Component 1: Number of unique IPs (40 points)
-        if unique_ips >= 20:
-            ip_score = 40.0
+        tier = bisect_right(self.FLUX_IP_TIERS, unique_ips)
+        ip_score = self.FLUX_IP_SCORES[tier]
+        if tier == 3:
             reasons.append(f"Very high number of unique IPs ({unique_ips})")
-        elif unique_ips >= 10:
-            ip_score = 30.0
+        elif tier == 2:
             reasons.append(f"High number of unique IPs ({unique_ips})")
-        elif unique_ips >= 5:
-            ip_score = 20.0
+        elif tier == 1:
             reasons.append(f"Multiple unique IPs ({unique_ips})")
-        else:
-            ip_score = 10.0
-
-        score += ip_score
 
         # Component 2: IP change rate (30 points)
-        if ip_changes_per_hour >= 5.0:
-            rate_score = 30.0
+        tier = bisect_right(self.FLUX_RATE_TIERS, ip_changes_per_hour)
+        rate_score = self.FLUX_RATE_SCORES[tier]
+        if tier == 3:
             reasons.append(f"Very high IP change rate ({ip_changes_per_hour:.1f}/hour)")
-        elif ip_changes_per_hour >= 2.0:
-            rate_score = 25.0
+        elif tier == 2:
             reasons.append(f"High IP change rate ({ip_changes_per_hour:.1f}/hour)")
-        elif ip_changes_per_hour >= 1.0:
-            rate_score = 15.0
+        elif tier == 1:
             reasons.append(f"Moderate IP change rate ({ip_changes_per_hour:.1f}/hour)")
-        else:
-            rate_score = 5.0
-
-        score += rate_score
 
         # Component 3: Low TTL (20 points)
-        if avg_ttl <= 300:
-            ttl_score = 20.0
+        tier = bisect_left(self.FLUX_TTL_TIERS, avg_ttl)
+        ttl_score = self.FLUX_TTL_SCORES[tier]
+        if tier == 0:
             reasons.append(f"Low TTL ({avg_ttl:.0f}s) enables rapid IP rotation")
-        elif avg_ttl <= 600:
-            ttl_score = 15.0
+        elif tier == 1:
             reasons.append(f"Below-average TTL ({avg_ttl:.0f}s)")
-        elif avg_ttl <= 1800:
-            ttl_score = 10.0
-        else:
-            ttl_score = 0.0
-
-        score += ttl_score
 
         # Component 4: Observation period (10 points)
-        if time_span_hours >= 24:
-            period_score = 10.0
+        tier = bisect_right(self.FLUX_PERIOD_TIERS, time_span_hours)
+        period_score = self.FLUX_PERIOD_SCORES[tier]
+        if tier == 3:
             reasons.append(f"Observed over {time_span_hours:.1f} hours")
-        elif time_span_hours >= 12:
-            period_score = 7.0
-        elif time_span_hours >= 4:
-            period_score = 5.0
-        else:
-            period_score = 2.0
 
-        score += period_score
+        score = ip_score + rate_score + ttl_score + period_score
 
         # Calculate confidence
         confidence = min(1.0, (query_count / 20.0) * 0.6 + (time_span_hours / 24.0) * 0.4)
 
         return score, confidence, reasons
 
+    def _aggregate_host_queries(
+        self,
+        ip_queries: dict[str, list[DnsQuery]],
+    ) -> dict[str, dict]:
+        """
+        Aggregate per-host counters in one pass over each host's queries.
+
+        Args:
+            ip_queries: Mapping of src_ip to queries
+
+        Returns:
+            Mapping of src_ip to a dict with the host's queries, unique_domains,
+            nxdomain_count, unusual_count and unusual_qtypes (qtype -> count,
+            first-seen order)
+        """
+        host_stats = {}
+
+        for src_ip, queries in ip_queries.items():
+            domains = set()
+            nxdomain_count = 0
+            unusual_count = 0
+            unusual_qtypes = defaultdict(int)
+            for query in queries:
+                domains.add(query.query)
+                if query.rcode == 'NXDOMAIN':
+                    nxdomain_count += 1
+                qtype = query.qtype
+                if qtype and qtype not in self.STANDARD_QTYPES:
+                    unusual_qtypes[qtype] += 1
+                    unusual_count += 1
+
+            host_stats[src_ip] = {
+                'queries': queries,
+                'unique_domains': len(domains),
+                'nxdomain_count': nxdomain_count,
+                'unusual_count': unusual_count,
+                'unusual_qtypes': unusual_qtypes,
+            }
+
+        return host_stats
+
+    def _host_time_bounds(self, stats: dict) -> tuple[float, float]:
+        """
+        Get a host's first/last query timestamps, computed on first use and
+        cached on its aggregates so hosts flagged by several detectors are
+        only scanned once.
+
+        Args:
+            stats: Per-host aggregates from _aggregate_host_queries
+
+        Returns:
+            Tuple of (first_seen, last_seen)
+        """
+        if 'first_seen' not in stats:
+            stats['first_seen'], stats['last_seen'] = self._time_bounds(stats['queries'])
+        return stats['first_seen'], stats['last_seen']
+
     def _detect_excessive_nxdomain(
         self,
-        dns_queries: list[DnsQuery],
+        host_stats: dict[str, dict],
     ) -> list[SuspiciousDnsPattern]:
         """
         Detect hosts generating excessive NXDOMAIN responses.
 
         Args:
-            dns_queries: List of DNS queries
+            host_stats: Per-host aggregates from _aggregate_host_queries
 
         Returns:
             List of suspicious patterns
         """
-        # Group by source IP
-        ip_queries = defaultdict(list)
-        for query in dns_queries:
-            ip_queries[query.src_ip].append(query)
-
         results = []
 
-        for src_ip, queries in ip_queries.items():
-            nxdomain_count = sum(1 for q in queries if q.rcode and 'NXDOMAIN' in q.rcode.upper())
+        for src_ip, stats in host_stats.items():
+            nxdomain_count = stats['nxdomain_count']
 
             if nxdomain_count < 10:
                 continue
 
+            queries = stats['queries']
+
             nxdomain_ratio = nxdomain_count / len(queries)
 
             if nxdomain_ratio >= 0.5:
                 score = 70.0 + (nxdomain_ratio * 30.0)
                 confidence = min(1.0, nxdomain_count / 50.0)
 
-                timestamps = [q.timestamp.timestamp() for q in queries]
+                first_seen, last_seen = self._host_time_bounds(stats)
 
                 result = SuspiciousDnsPattern(
                     pattern_type="excessive_nxdomain",
                     src_ip=src_ip,
                     query_count=len(queries),
-                    unique_domains=len(set(q.query for q in queries)),
+                    unique_domains=stats['unique_domains'],
                     anomaly_indicators=[
                         f"NXDOMAIN rate: {nxdomain_ratio:.0%}",
                         f"Total NXDOMAIN: {nxdomain_count}",
@@ -1105,8 +1422,8 @@ class DnsAnalyzer:
                         f"{nxdomain_count} failed DNS lookups may indicate scanning or DGA probing",
                     ],
                     mitre_techniques=['T1046', 'T1590.002'],  # Network Service Discovery, DNS enumeration
-                    first_seen=min(timestamps),
-                    last_seen=max(timestamps),
+                    first_seen=first_seen,
+                    last_seen=last_seen,
                 )
 
                 results.append(result)
@@ -1115,43 +1432,39 @@ class DnsAnalyzer:
 
     def _detect_unusual_query_types(
         self,
-        dns_queries: list[DnsQuery],
+        host_stats: dict[str, dict],
     ) -> list[SuspiciousDnsPattern]:
         """
         Detect unusual DNS query types that may indicate reconnaissance or tunneling.
 
         Args:
-            dns_queries: List of DNS queries
+            host_stats: Per-host aggregates from _aggregate_host_queries
 
         Returns:
             List of suspicious patterns
         """
-        # Group by source IP and query type
-        ip_qtype_counts = defaultdict(lambda: defaultdict(int))
-
-        for query in dns_queries:
-            if query.qtype and query.qtype.upper() not in {'A', 'AAAA', 'CNAME', 'MX', 'PTR', 'NS'}:
-                ip_qtype_counts[query.src_ip][query.qtype] += 1
-
         results = []
 
-        for src_ip, qtype_counts in ip_qtype_counts.items():
-            total_unusual = sum(qtype_counts.values())
+        for src_ip, stats in host_stats.items():
+            # Query types outside the standard set
+            qtype_counts = stats['unusual_qtypes']
+            total_unusual = stats['unusual_count']
 
             if total_unusual < 5:
                 continue
 
+            queries = stats['queries']
+
             score = min(80.0, 40.0 + (total_unusual * 2.0))
             confidence = min(1.0, total_unusual / 20.0)
 
             # Get timestamps
-            ip_queries = [q for q in dns_queries if q.src_ip == src_ip]
-            timestamps = [q.timestamp.timestamp() for q in ip_queries]
+            first_seen, last_seen = self._host_time_bounds(stats)
 
             result = SuspiciousDnsPattern(
                 pattern_type="unusual_query_types",
                 src_ip=src_ip,
-                query_count=len(ip_queries),
+                query_count=len(queries),
                 anomaly_indicators=[f"{qtype}: {count}" for qtype, count in qtype_counts.items()],
                 suspicion_score=score,
                 confidence=confidence,
@@ -1160,8 +1473,8 @@ class DnsAnalyzer:
                     f"{total_unusual} non-standard queries may indicate reconnaissance or tunneling",
                 ],
                 mitre_techniques=['T1590.002', 'T1071.004'],  # DNS enumeration, DNS protocol
-                first_seen=min(timestamps),
-                last_seen=max(timestamps),
+                first_seen=first_seen,
+                last_seen=last_seen,
             )
 
             results.append(result)
@@ -1170,24 +1483,17 @@ class DnsAnalyzer:
 
     def _detect_high_query_rate(
         self,
-        dns_queries: list[DnsQuery],
+        ip_domain_queries: dict[tuple[str, str], list[DnsQuery]],
     ) -> list[SuspiciousDnsPattern]:
         """
         Detect abnormally high query rates to single domains.
 
         Args:
-            dns_queries: List of DNS queries
+            ip_domain_queries: Mapping of (src_ip, lowercased domain) to queries
 
         Returns:
             List of suspicious patterns
         """
-        # Group by (src_ip, domain)
-        ip_domain_queries = defaultdict(list)
-
-        for query in dns_queries:
-            key = (query.src_ip, query.query.lower())
-            ip_domain_queries[key].append(query)
-
         results = []
 
         for (src_ip, domain), queries in ip_domain_queries.items():
@@ -1195,8 +1501,8 @@ class DnsAnalyzer:
                 continue
 
             # Calculate time span
-            timestamps = [q.timestamp.timestamp() for q in queries]
-            time_span = max(timestamps) - min(timestamps)
+            first_seen, last_seen = self._time_bounds(queries)
+            time_span = last_seen - first_seen
 
             if time_span < 60:  # Less than 1 minute
                 continue
@@ -1223,8 +1529,8 @@ class DnsAnalyzer:
                         "May indicate automated tunneling, exfiltration, or beaconing",
                     ],
                     mitre_techniques=['T1071.004', 'T1041'],  # DNS protocol, C2 exfiltration
-                    first_seen=min(timestamps),
-                    last_seen=max(timestamps),
+                    first_seen=first_seen,
+                    last_seen=last_seen,
                 )
 
                 results.append(result)
@@ -2,17 +2,22 @@
 HTTP anomaly detection service.
 Detects unusual user-agents, methods, large POSTs, directory traversal, suspicious URIs.
 """
-import random
-from dataclasses import dataclass, field, asdict
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional
 
+import numpy as np
+
 SUSPICIOUS_USER_AGENTS = [
     "python-requests/2.28.0", "curl/7.88.1", "Go-http-client/1.1",
     "Wget/1.21", "sqlmap/1.7", "Nikto/2.5", "DirBuster/1.0",
     "Hydra/9.5", "", "Mozilla/4.0 (compatible; MSIE 6.0)",
     "masscan/1.3", "Nmap Scripting Engine", "ZmEu",
 ]
+SUSPICIOUS_USER_AGENT_SET = frozenset(SUSPICIOUS_USER_AGENTS)
 
 NORMAL_USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
@@ -32,7 +37,16 @@ SUSPICIOUS_URI_PATTERNS = [
 ]
 
 
-@dataclass
+def _compile_literals(patterns: list[str]) -> re.Pattern:
+    """Compile literal substrings into one alternation so a URI is scanned in a single C-level pass."""
+    return re.compile("|".join(re.escape(p) for p in patterns))
+
+
+_TRAVERSAL_RE = _compile_literals(TRAVERSAL_PATTERNS)
+_SUSPICIOUS_URI_RE = _compile_literals(SUSPICIOUS_URI_PATTERNS)
+
+
+@dataclass(slots=True)
 class HttpSession:
     uid: str
     ts: str
@@ -49,9 +63,35 @@ class HttpSession:
     anomalies: list[str] = field(default_factory=list)
     score: str = "clean"
     mitre: list[str] = field(default_factory=list)
+    # Lowercased URI for pattern matching, derived once at construction
+    _uri_lower: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self):
+        # Low-cardinality strings: intern so repeats share one object and compare by identity;
+        # methods are canonicalized to uppercase here so analyze() compares them directly
+        self.method = sys.intern(self.method.upper())
+        self.user_agent = sys.intern(self.user_agent)
+        self._uri_lower = self.uri.lower()
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Flat record: build the dict directly rather than through asdict's recursive deepcopy
+        return {
+            "uid": self.uid,
+            "ts": self.ts,
+            "src_ip": self.src_ip,
+            "src_port": self.src_port,
+            "dst_ip": self.dst_ip,
+            "dst_port": self.dst_port,
+            "method": self.method,
+            "uri": self.uri,
+            "user_agent": self.user_agent,
+            "status_code": self.status_code,
+            "request_body_len": self.request_body_len,
+            "response_body_len": self.response_body_len,
+            "anomalies": list(self.anomalies),
+            "score": self.score,
+            "mitre": list(self.mitre),
+        }
 
 
 class HttpAnalyzer:
@@ -65,33 +105,31 @@ class HttpAnalyzer:
             s.mitre = []
 
             # Unusual user-agent
-            if s.user_agent in SUSPICIOUS_USER_AGENTS or not s.user_agent:
+            if not s.user_agent or s.user_agent in SUSPICIOUS_USER_AGENT_SET:
                 s.anomalies.append(f"Suspicious user-agent: {s.user_agent or '(empty)'}")
                 s.mitre.append("T1071.001 - Web Protocols")
 
             # Unusual method
-            if s.method.upper() in SUSPICIOUS_METHODS:
+            if s.method in SUSPICIOUS_METHODS:
                 s.anomalies.append(f"Unusual HTTP method: {s.method}")
 
             # Large POST (potential exfil)
-            if s.method.upper() == "POST" and s.request_body_len > 1_000_000:
+            if s.method == "POST" and s.request_body_len > 1_000_000:
                 s.anomalies.append(f"Large POST body: {s.request_body_len:,} bytes")
                 s.mitre.append("T1048 - Exfiltration Over Alternative Protocol")
 
-            # Directory traversal
-            uri_lower = s.uri.lower()
-            for pattern in TRAVERSAL_PATTERNS:
-                if pattern in uri_lower:
-                    s.anomalies.append(f"Directory traversal attempt: {pattern}")
-                    s.mitre.append("T1083 - File and Directory Discovery")
-                    break
+            # Directory traversal (report the earliest match in the URI)
+            uri_lower = s._uri_lower
+            match = _TRAVERSAL_RE.search(uri_lower)
+            if match:
+                s.anomalies.append(f"Directory traversal attempt: {match.group(0)}")
+                s.mitre.append("T1083 - File and Directory Discovery")
 
             # Suspicious URI
-            for pattern in SUSPICIOUS_URI_PATTERNS:
-                if pattern in uri_lower:
-                    s.anomalies.append(f"Suspicious URI pattern: {pattern}")
-                    s.mitre.append("T1190 - Exploit Public-Facing Application")
-                    break
+            match = _SUSPICIOUS_URI_RE.search(uri_lower)
+            if match:
+                s.anomalies.append(f"Suspicious URI pattern: {match.group(0)}")
+                s.mitre.append("T1190 - Exploit Public-Facing Application")
 
             # Score
             if len(s.anomalies) >= 3:
@@ -104,66 +142,95 @@ class HttpAnalyzer:
         return target
 
     def get_stats(self) -> dict:
-        total = len(self.sessions)
-        anomalous = sum(1 for s in self.sessions if s.anomalies)
-        methods = {}
-        uas = {}
+        methods = Counter()
+        uas = Counter()
+        anomalous = malicious = suspicious = 0
         for s in self.sessions:
-            methods[s.method] = methods.get(s.method, 0) + 1
-            ua_short = (s.user_agent or "(empty)")[:50]
-            uas[ua_short] = uas.get(ua_short, 0) + 1
+            methods[s.method] += 1
+            uas[(s.user_agent or "(empty)")[:50]] += 1
+            if s.anomalies:
+                anomalous += 1
+            if s.score == "malicious":
+                malicious += 1
+            elif s.score == "suspicious":
+                suspicious += 1
         return {
-            "total_requests": total,
+            "total_requests": len(self.sessions),
             "anomalies_found": anomalous,
-            "top_methods": sorted(methods.items(), key=lambda x: -x[1])[:10],
-            "top_user_agents": sorted(uas.items(), key=lambda x: -x[1])[:10],
-            "malicious": sum(1 for s in self.sessions if s.score == "malicious"),
-            "suspicious": sum(1 for s in self.sessions if s.score == "suspicious"),
+            "top_methods": methods.most_common(10),
+            "top_user_agents": uas.most_common(10),
+            "malicious": malicious,
+            "suspicious": suspicious,
         }
 
     def generate_demo_data(self, count: int = 80) -> list[HttpSession]:
         now = datetime.now()
-        sessions = []
+        rng = np.random.default_rng()
         src_ip = "10.0.1.50"
         normal_uris = ["/", "/index.html", "/api/v1/users", "/assets/main.css", "/favicon.ico", "/api/health"]
-
-        for i in range(count):
-            ts = (now - timedelta(minutes=random.randint(1, 1440))).isoformat()
-            is_attack = i < 5
-            is_scan = 5 <= i < 12
-
-            if is_attack:
-                method = random.choice(["POST", "PUT", "GET"])
-                uri = random.choice([
-                    "/../../etc/passwd", "/admin/exec?cmd=id", "/.env",
-                    "/wp-login.php", "/api/console",
-                ])
-                ua = random.choice(SUSPICIOUS_USER_AGENTS)
-                body_len = random.randint(0, 5_000_000) if method == "POST" else 0
-                status = random.choice([200, 403, 500])
-            elif is_scan:
-                method = random.choice(["GET", "HEAD", "OPTIONS", "TRACE"])
-                uri = random.choice(SUSPICIOUS_URI_PATTERNS + normal_uris)
-                ua = random.choice(SUSPICIOUS_USER_AGENTS[:6])
-                body_len = 0
-                status = random.choice([200, 301, 404])
-            else:
-                method = random.choice(["GET", "GET", "GET", "POST", "HEAD"])
-                uri = random.choice(normal_uris)
-                ua = random.choice(NORMAL_USER_AGENTS)
-                body_len = random.randint(100, 50000) if method == "POST" else 0
-                status = 200
-
-            session = HttpSession(
-                uid=f"C{random.randint(100000,999999)}.{random.randint(1,99)}",
-                ts=ts, src_ip=src_ip, src_port=random.randint(49152, 65535),
-                dst_ip=f"{random.randint(1,223)}.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}",
-                dst_port=random.choice([80, 443, 8080, 8443]),
-                method=method, uri=uri, user_agent=ua,
-                status_code=status, request_body_len=body_len,
-                response_body_len=random.randint(200, 500000),
+        attack_uris = [
+            "/../../etc/passwd", "/admin/exec?cmd=id", "/.env",
+            "/wp-login.php", "/api/console",
+        ]
+
+        # The first 5 sessions are attacks, the next 7 scans, the rest normal traffic
+        n_attack = min(count, 5)
+        n_scan = min(count - n_attack, 7)
+        n_normal = count - n_attack - n_scan
+
+        attack_methods = rng.choice(["POST", "PUT", "GET"], n_attack)
+        attack_bodies = np.where(attack_methods == "POST", rng.integers(0, 5_000_001, n_attack), 0)
+        normal_methods = rng.choice(["GET", "GET", "GET", "POST", "HEAD"], n_normal)
+        normal_bodies = np.where(normal_methods == "POST", rng.integers(100, 50_001, n_normal), 0)
+
+        methods = np.concatenate([
+            attack_methods,
+            rng.choice(["GET", "HEAD", "OPTIONS", "TRACE"], n_scan),
+            normal_methods,
+        ]).tolist()
+        uris = np.concatenate([
+            rng.choice(attack_uris, n_attack),
+            rng.choice(SUSPICIOUS_URI_PATTERNS + normal_uris, n_scan),
+            rng.choice(normal_uris, n_normal),
+        ]).tolist()
+        uas = np.concatenate([
+            rng.choice(SUSPICIOUS_USER_AGENTS, n_attack),
+            rng.choice(SUSPICIOUS_USER_AGENTS[:6], n_scan),
+            rng.choice(NORMAL_USER_AGENTS, n_normal),
+        ]).tolist()
+        body_lens = np.concatenate([attack_bodies, np.zeros(n_scan, dtype=int), normal_bodies]).tolist()
+        statuses = np.concatenate([
+            rng.choice([200, 403, 500], n_attack),
+            rng.choice([200, 301, 404], n_scan),
+            np.full(n_normal, 200),
+        ]).tolist()
+
+        minutes = rng.integers(1, 1441, count).tolist()
+        uid_hi = rng.integers(100000, 1_000_000, count).tolist()
+        uid_lo = rng.integers(1, 100, count).tolist()
+        src_ports = rng.integers(49152, 65536, count).tolist()
+        octets = np.column_stack([
+            rng.integers(1, 224, count),
+            rng.integers(0, 256, count),
+            rng.integers(0, 256, count),
+            rng.integers(1, 255, count),
+        ]).tolist()
+        dst_ports = rng.choice([80, 443, 8080, 8443], count).tolist()
+        response_lens = rng.integers(200, 500_001, count).tolist()
+
+        sessions = [
+            HttpSession(
+                uid=f"C{uid_hi[i]}.{uid_lo[i]}",
+                ts=(now - timedelta(minutes=minutes[i])).isoformat(),
+                src_ip=src_ip, src_port=src_ports[i],
+                dst_ip=".".join(map(str, octets[i])),
+                dst_port=dst_ports[i],
+                method=methods[i], uri=uris[i], user_agent=uas[i],
+                status_code=statuses[i], request_body_len=body_lens[i],
+                response_body_len=response_lens[i],
             )
-            sessions.append(session)
+            for i in range(count)
+        ]
 
         self.sessions = sessions
         self.analyze()
@@ -1,162 +1,236 @@
 """Hunt hypotheses service with file-backed JSON storage and template seeding."""
 from __future__ import annotations
 
-import json
+import os
+import tempfile
+from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 from uuid import uuid4
 
+import orjson
+
+# Starter hypotheses seeded into an empty store
+SEED_TEMPLATES: tuple[dict[str, Any], ...] = (
+    {
+        "title": "C2 Beaconing Detection",
+        "description": "Identify periodic outbound communication patterns consistent with command-and-control beaconing.",
+        "mitre_techniques": ["T1071", "T1041"],
+        "data_sources": ["conn.log", "dns.log", "beacons"],
+        "status": "active",
+        "tags": ["c2", "beaconing", "command-and-control"],
+        "steps": [
+            {
+                "description": "Find hosts with periodic outbound connections to a single destination.",
+                "query_hint": "Group connections by src_ip/dst_ip and flag low interval variance over time",
+                "expected_result": "Small set of internal hosts with recurring intervals to one external endpoint",
+            },
+            {
+                "description": "Review beacon detections with score > 0.8 for identified hosts.",
+                "query_hint": "Filter beacons where beacon_score > 0.8 and src_ip in candidate host list",
+                "expected_result": "High-confidence beacon sessions linked to suspicious endpoints",
+            },
+            {
+                "description": "Correlate suspicious destinations with DNS lookup behavior.",
+                "query_hint": "Join conn destinations with dns queries to detect DGAs/new domains/low TTL",
+                "expected_result": "Domain context that reinforces C2 suspicion",
+            },
+        ],
+    },
+    {
+        "title": "DNS Tunneling Investigation",
+        "description": "Hunt for DNS abuse patterns that indicate covert data transfer over DNS.",
+        "mitre_techniques": ["T1071.004", "T1048"],
+        "data_sources": ["dns.log", "conn.log"],
+        "status": "active",
+        "tags": ["dns", "tunneling", "exfiltration"],
+        "steps": [
+            {
+                "description": "Identify domains with unusually high subdomain cardinality.",
+                "query_hint": "Count unique subdomains per base domain and rank descending",
+                "expected_result": "Outlier domains with abnormal subdomain churn",
+            },
+            {
+                "description": "Analyze TXT query frequency and payload characteristics.",
+                "query_hint": "Filter qtype_name=TXT and inspect record length/entropy",
+                "expected_result": "Suspicious TXT usage inconsistent with normal operations",
+            },
+            {
+                "description": "Search for encoded or chunked payload patterns in DNS labels.",
+                "query_hint": "Detect base64-like/hex-like labels and sequential chunk patterns",
+                "expected_result": "Evidence of encoded data movement via DNS",
+            },
+        ],
+    },
+    {
+        "title": "Data Exfiltration Hunt",
+        "description": "Detect potential outbound data exfiltration using transfer and protocol anomalies.",
+        "mitre_techniques": ["T1041", "T1567"],
+        "data_sources": ["conn.log", "files.log", "http.log"],
+        "status": "draft",
+        "tags": ["exfiltration", "egress", "anomaly"],
+        "steps": [
+            {
+                "description": "Find large outbound transfers by bytes sent and session duration.",
+                "query_hint": "Sort outbound flows by orig_bytes and long duration sessions",
+                "expected_result": "Top candidates for exfiltration review",
+            },
+            {
+                "description": "Detect unusual protocols operating on standard ports.",
+                "query_hint": "Compare service/proto values against expected port mappings (e.g., non-HTTPS on 443)",
+                "expected_result": "Protocol/port mismatches indicating covert channels",
+            },
+            {
+                "description": "Flag asymmetric traffic ratios indicating one-way bulk movement.",
+                "query_hint": "Compute orig_bytes/resp_bytes ratios and filter extreme outliers",
+                "expected_result": "Sessions with exfiltration-like outbound dominance",
+            },
+        ],
+    },
+    {
+        "title": "Lateral Movement Detection",
+        "description": "Uncover suspicious east-west activity consistent with lateral movement.",
+        "mitre_techniques": ["T1021", "T1078"],
+        "data_sources": ["conn.log", "smb.log", "rdp.log", "auth.log"],
+        "status": "draft",
+        "tags": ["lateral-movement", "internal", "credentials"],
+        "steps": [
+            {
+                "description": "Identify internal SMB/RDP/WMI connection spikes or anomalies.",
+                "query_hint": "Filter private-to-private traffic on 445/3389/135 and compare to baseline",
+                "expected_result": "Hosts with unusual remote admin traffic",
+            },
+            {
+                "description": "Find newly observed host-to-host communication pairs.",
+                "query_hint": "Diff recent internal edges against historical baseline graph",
+                "expected_result": "Novel internal paths requiring validation",
+            },
+            {
+                "description": "Review credential usage patterns across systems and time windows.",
+                "query_hint": "Correlate auth events for shared credentials across multiple hosts",
+                "expected_result": "Potential credential reuse or lateral pivot indicators",
+            },
+        ],
+    },
+    {
+        "title": "Rogue Service Discovery",
+        "description": "Detect unauthorized services and suspicious listening behavior inside the environment.",
+        "mitre_techniques": ["T1571", "T1105"],
+        "data_sources": ["conn.log", "service_inventory", "suricata"],
+        "status": "draft",
+        "tags": ["rogue-service", "ports", "discovery"],
+        "steps": [
+            {
+                "description": "Detect unexpected listening services on internal hosts.",
+                "query_hint": "Compare observed server ports to approved service inventory",
+                "expected_result": "Hosts exposing unapproved services",
+            },
+            {
+                "description": "Identify new traffic on unusual or high-risk ports.",
+                "query_hint": "Flag first-seen destination ports and low-prevalence services",
+                "expected_result": "Recently introduced service endpoints",
+            },
+            {
+                "description": "Validate protocol/service consistency for suspicious endpoints.",
+                "query_hint": "Match application protocol signatures against expected service labels",
+                "expected_result": "Protocol mismatches indicating masquerading or tunneling",
+            },
+        ],
+    },
+)
+
 
 class HuntHypothesesService:
     VALID_STATUS = {"draft", "active", "completed"}
+    INDEX_FILENAME = "_index.json"
+    SEEDED_SENTINEL = ".seeded"
 
     def __init__(self, hypotheses_dir: Optional[Path] = None):
         base_dir = Path(__file__).resolve().parents[2]
         self.hypotheses_dir = hypotheses_dir or (base_dir / "data" / "hypotheses")
         self.hypotheses_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.hypotheses_dir / self.INDEX_FILENAME
+        self._dir_prefix = str(self.hypotheses_dir) + os.sep
+        self._seeded = False
 
     @staticmethod
     def _now_iso() -> str:
         return datetime.now(timezone.utc).isoformat()
 
-    def _hypothesis_path(self, hypothesis_id: str) -> Path:
-        return self.hypotheses_dir / f"{hypothesis_id}.json"
+    def _hypothesis_path(self, hypothesis_id: str) -> str:
+        # Plain string join against a precomputed prefix; no Path object per CRUD call
+        return f"{self._dir_prefix}{hypothesis_id}.json"
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        """Load the id -> hypothesis index, rebuilding it from the per-id files if missing or stale.
+
+        _save_index stamps the index with the directory's mtime, so a file added,
+        removed or renamed into place since then (by another process or by hand)
+        leaves the directory newer than the index.
+        """
+        try:
+            index_mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            index_mtime = None
+        if index_mtime is not None and index_mtime >= os.stat(self.hypotheses_dir).st_mtime_ns:
+            try:
+                return orjson.loads(self.index_path.read_bytes())
+            except Exception:
+                pass
+
+        index: dict[str, dict[str, Any]] = {}
+        with os.scandir(self.hypotheses_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or entry.name == self.INDEX_FILENAME:
+                    continue
+                try:
+                    with open(entry.path, "rb") as f:
+                        item = orjson.loads(f.read())
+                except Exception:
+                    continue
+                index[entry.name[:-len(".json")]] = item
+        self._save_index(index)
+        return index
+
+    @staticmethod
+    def _atomic_write(path: str | Path, data: bytes) -> None:
+        """Write via a temp file and rename so readers never see a partial file."""
+        dirname, basename = os.path.split(path)
+        # Unique temp name per write, so concurrent writers never share one
+        tmp = tempfile.NamedTemporaryFile(dir=dirname, prefix=f".{basename}.", suffix=".tmp", delete=False)
+        try:
+            with tmp:
+                tmp.write(data)
+            os.replace(tmp.name, path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+
+    def _save_index(self, index: dict[str, dict[str, Any]]) -> None:
+        self._atomic_write(self.index_path, orjson.dumps(index))
+        # Match the directory's mtime (which the rename just bumped); see _load_index
+        dir_mtime = os.stat(self.hypotheses_dir).st_mtime_ns
+        os.utime(self.index_path, ns=(dir_mtime, dir_mtime))
 
     def _seed_if_empty(self) -> None:
-        if any(self.hypotheses_dir.glob("*.json")):
+        # Templates are seeded once per store; the sentinel survives restarts and
+        # keeps deleted templates from coming back
+        if self._seeded:
+            return
+        sentinel = self.hypotheses_dir / self.SEEDED_SENTINEL
+        if sentinel.exists():
+            self._seeded = True
+            return
+        if self._load_index():
+            sentinel.touch()
+            self._seeded = True
             return
 
-        templates = [
-            {
-                "title": "C2 Beaconing Detection",
-                "description": "Identify periodic outbound communication patterns consistent with command-and-control beaconing.",
-                "mitre_techniques": ["T1071", "T1041"],
-                "data_sources": ["conn.log", "dns.log", "beacons"],
-                "status": "active",
-                "tags": ["c2", "beaconing", "command-and-control"],
-                "steps": [
-                    {
-                        "description": "Find hosts with periodic outbound connections to a single destination.",
-                        "query_hint": "Group connections by src_ip/dst_ip and flag low interval variance over time",
-                        "expected_result": "Small set of internal hosts with recurring intervals to one external endpoint",
-                    },
-                    {
-                        "description": "Review beacon detections with score > 0.8 for identified hosts.",
-                        "query_hint": "Filter beacons where beacon_score > 0.8 and src_ip in candidate host list",
-                        "expected_result": "High-confidence beacon sessions linked to suspicious endpoints",
-                    },
-                    {
-                        "description": "Correlate suspicious destinations with DNS lookup behavior.",
-                        "query_hint": "Join conn destinations with dns queries to detect DGAs/new domains/low TTL",
-                        "expected_result": "Domain context that reinforces C2 suspicion",
-                    },
-                ],
-            },
-            {
-                "title": "DNS Tunneling Investigation",
-                "description": "Hunt for DNS abuse patterns that indicate covert data transfer over DNS.",
-                "mitre_techniques": ["T1071.004", "T1048"],
-                "data_sources": ["dns.log", "conn.log"],
-                "status": "active",
-                "tags": ["dns", "tunneling", "exfiltration"],
-                "steps": [
-                    {
-                        "description": "Identify domains with unusually high subdomain cardinality.",
-                        "query_hint": "Count unique subdomains per base domain and rank descending",
-                        "expected_result": "Outlier domains with abnormal subdomain churn",
-                    },
-                    {
-                        "description": "Analyze TXT query frequency and payload characteristics.",
-                        "query_hint": "Filter qtype_name=TXT and inspect record length/entropy",
-                        "expected_result": "Suspicious TXT usage inconsistent with normal operations",
-                    },
-                    {
-                        "description": "Search for encoded or chunked payload patterns in DNS labels.",
-                        "query_hint": "Detect base64-like/hex-like labels and sequential chunk patterns",
-                        "expected_result": "Evidence of encoded data movement via DNS",
-                    },
-                ],
-            },
-            {
-                "title": "Data Exfiltration Hunt",
-                "description": "Detect potential outbound data exfiltration using transfer and protocol anomalies.",
-                "mitre_techniques": ["T1041", "T1567"],
-                "data_sources": ["conn.log", "files.log", "http.log"],
-                "status": "draft",
-                "tags": ["exfiltration", "egress", "anomaly"],
-                "steps": [
-                    {
-                        "description": "Find large outbound transfers by bytes sent and session duration.",
-                        "query_hint": "Sort outbound flows by orig_bytes and long duration sessions",
-                        "expected_result": "Top candidates for exfiltration review",
-                    },
-                    {
-                        "description": "Detect unusual protocols operating on standard ports.",
-                        "query_hint": "Compare service/proto values against expected port mappings (e.g., non-HTTPS on 443)",
-                        "expected_result": "Protocol/port mismatches indicating covert channels",
-                    },
-                    {
-                        "description": "Flag asymmetric traffic ratios indicating one-way bulk movement.",
-                        "query_hint": "Compute orig_bytes/resp_bytes ratios and filter extreme outliers",
-                        "expected_result": "Sessions with exfiltration-like outbound dominance",
-                    },
-                ],
-            },
-            {
-                "title": "Lateral Movement Detection",
-                "description": "Uncover suspicious east-west activity consistent with lateral movement.",
-                "mitre_techniques": ["T1021", "T1078"],
-                "data_sources": ["conn.log", "smb.log", "rdp.log", "auth.log"],
-                "status": "draft",
-                "tags": ["lateral-movement", "internal", "credentials"],
-                "steps": [
-                    {
-                        "description": "Identify internal SMB/RDP/WMI connection spikes or anomalies.",
-                        "query_hint": "Filter private-to-private traffic on 445/3389/135 and compare to baseline",
-                        "expected_result": "Hosts with unusual remote admin traffic",
-                    },
-                    {
-                        "description": "Find newly observed host-to-host communication pairs.",
-                        "query_hint": "Diff recent internal edges against historical baseline graph",
-                        "expected_result": "Novel internal paths requiring validation",
-                    },
-                    {
-                        "description": "Review credential usage patterns across systems and time windows.",
-                        "query_hint": "Correlate auth events for shared credentials across multiple hosts",
-                        "expected_result": "Potential credential reuse or lateral pivot indicators",
-                    },
-                ],
-            },
-            {
-                "title": "Rogue Service Discovery",
-                "description": "Detect unauthorized services and suspicious listening behavior inside the environment.",
-                "mitre_techniques": ["T1571", "T1105"],
-                "data_sources": ["conn.log", "service_inventory", "suricata"],
-                "status": "draft",
-                "tags": ["rogue-service", "ports", "discovery"],
-                "steps": [
-                    {
-                        "description": "Detect unexpected listening services on internal hosts.",
-                        "query_hint": "Compare observed server ports to approved service inventory",
-                        "expected_result": "Hosts exposing unapproved services",
-                    },
-                    {
-                        "description": "Identify new traffic on unusual or high-risk ports.",
-                        "query_hint": "Flag first-seen destination ports and low-prevalence services",
-                        "expected_result": "Recently introduced service endpoints",
-                    },
-                    {
-                        "description": "Validate protocol/service consistency for suspicious endpoints.",
-                        "query_hint": "Match application protocol signatures against expected service labels",
-                        "expected_result": "Protocol mismatches indicating masquerading or tunneling",
-                    },
-                ],
-            },
-        ]
+        self._write_batch([self._new_hypothesis(deepcopy(template)) for template in SEED_TEMPLATES])
 
-        for template in templates:
-            self.create(template)
+        sentinel.touch()
+        self._seeded = True
 
     def _normalize_steps(self, steps: list[dict[str, Any]]) -> list[dict[str, Any]]:
         normalized: list[dict[str, Any]] = []
@@ -174,39 +248,51 @@ class HuntHypothesesService:
         return normalized
 
     def _read(self, hypothesis_id: str) -> dict[str, Any]:
-        path = self._hypothesis_path(hypothesis_id)
-        if not path.exists():
-            raise FileNotFoundError(f"Hypothesis not found: {hypothesis_id}")
-        return json.loads(path.read_text(encoding="utf-8"))
+        try:
+            with open(self._hypothesis_path(hypothesis_id), "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Hypothesis not found: {hypothesis_id}") from None
 
     def _write(self, hypothesis: dict[str, Any]) -> dict[str, Any]:
-        hypothesis["updated_at"] = self._now_iso()
-        completed = all(step.get("completed") for step in hypothesis.get("steps", [])) and len(hypothesis.get("steps", [])) > 0
-        if completed:
-            hypothesis["status"] = "completed"
-            hypothesis["completed_at"] = hypothesis.get("completed_at") or self._now_iso()
-        elif hypothesis.get("status") == "completed":
-            hypothesis["status"] = "active"
-            hypothesis["completed_at"] = None
+        return self._write_batch([hypothesis])[0]
 
-        path = self._hypothesis_path(hypothesis["id"])
-        path.write_text(json.dumps(hypothesis, indent=2), encoding="utf-8")
-        return hypothesis
+    def _write_batch(self, hypotheses: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Write hypothesis files, then update the listing index once for the whole batch."""
+        # Load before writing: our own renames make the directory newer than the index
+        index = self._load_index()
+        for hypothesis in hypotheses:
+            hypothesis["updated_at"] = self._now_iso()
+            completed = all(step.get("completed") for step in hypothesis.get("steps", [])) and len(hypothesis.get("steps", [])) > 0
+            if completed:
+                hypothesis["status"] = "completed"
+                hypothesis["completed_at"] = hypothesis.get("completed_at") or self._now_iso()
+            elif hypothesis.get("status") == "completed":
+                hypothesis["status"] = "active"
+                hypothesis["completed_at"] = None
+
+            self._atomic_write(self._hypothesis_path(hypothesis["id"]), orjson.dumps(hypothesis))
+
+        for hypothesis in hypotheses:
+            index[hypothesis["id"]] = hypothesis
+        self._save_index(index)
+        return hypotheses
 
     def list_all(self, status: Optional[str] = None) -> list[dict[str, Any]]:
         self._seed_if_empty()
+        index = self._load_index()
         items: list[dict[str, Any]] = []
-        for path in sorted(self.hypotheses_dir.glob("*.json"), reverse=True):
-            try:
-                item = json.loads(path.read_text(encoding="utf-8"))
-            except Exception:
-                continue
+        for hypothesis_id in sorted(index, reverse=True):
+            item = index[hypothesis_id]
             if status and item.get("status") != status:
                 continue
             items.append(item)
         return items
 
     def create(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return self._write(self._new_hypothesis(payload))
+
+    def _new_hypothesis(self, payload: dict[str, Any]) -> dict[str, Any]:
         now = self._now_iso()
         status = payload.get("status", "draft")
         if status not in self.VALID_STATUS:
@@ -225,7 +311,7 @@ class HuntHypothesesService:
             "completed_at": payload.get("completed_at"),
             "tags": payload.get("tags", []),
         }
-        return self._write(hypothesis)
+        return hypothesis
 
     def get(self, hypothesis_id: str) -> dict[str, Any]:
         self._seed_if_empty()
@@ -253,10 +339,14 @@ class HuntHypothesesService:
         return self._write(hypothesis)
 
     def delete(self, hypothesis_id: str) -> None:
-        path = self._hypothesis_path(hypothesis_id)
-        if not path.exists():
-            raise FileNotFoundError(f"Hypothesis not found: {hypothesis_id}")
-        path.unlink()
+        index = self._load_index()
+        try:
+            os.unlink(self._hypothesis_path(hypothesis_id))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Hypothesis not found: {hypothesis_id}") from None
+
+        index.pop(hypothesis_id, None)
+        self._save_index(index)
 
     def complete_step(self, hypothesis_id: str, step_index: int, actual_result: Optional[str]) -> dict[str, Any]:
         hypothesis = self._read(hypothesis_id)
@@ -4,11 +4,15 @@ Identifies internal-to-internal connections on SMB, RDP, WMI, SSH.
 Flags credential spray patterns and multi-target scanning.
 """
 import ipaddress
-import random
-from dataclasses import dataclass, field, asdict
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 
+import numpy as np
+
 LATERAL_PORTS = {
     445: "SMB",
     3389: "RDP",
@@ -19,8 +23,63 @@ LATERAL_PORTS = {
     139: "NetBIOS",
 }
 
+# (minimum distinct targets, risk points, pattern) checked in order
+TARGET_RISK_TIERS = (
+    (10, 40.0, "mass_scan"),
+    (5, 25.0, "multi_target"),
+    (0, 10.0, None),
+)
+
+# (minimum risk score, level) checked in order
+RISK_LEVELS = (
+    (70, "critical"),
+    (50, "high"),
+    (30, "medium"),
+    (0, "low"),
+)
+
+# One bit per lateral port, so a source's service set is a small int
+_PORT_BITS = {port: 1 << i for i, port in enumerate(LATERAL_PORTS)}
+
+
+def _service_profile(mask: int) -> tuple[list[str], float, list[str]]:
+    """Services, service risk points and MITRE techniques for a port bitmask."""
+    services = [name for port, name in LATERAL_PORTS.items() if mask & _PORT_BITS[port]]
+    risk = 0.0
+    mitre = []
+
+    if len(services) >= 3:
+        risk += 15
+        mitre.append("T1021 - Remote Services")
+    if "SMB" in services:
+        risk += 10
+        mitre.append("T1021.002 - SMB/Windows Admin Shares")
+    if "RDP" in services:
+        risk += 10
+        mitre.append("T1021.001 - Remote Desktop Protocol")
+    if "WMI/DCOM" in services:
+        risk += 15
+        mitre.append("T1047 - Windows Management Instrumentation")
+
+    if not mitre:
+        mitre.append("T1570 - Lateral Tool Transfer")
+
+    return services, risk, mitre
+
+
+_SERVICE_PROFILES = [_service_profile(mask) for mask in range(1 << len(LATERAL_PORTS))]
+
+
+@lru_cache(maxsize=65536)
+def _is_private_ip(ip: str) -> bool:
+    # Hosts recur across many connections; cache so each address is parsed once
+    try:
+        return ipaddress.ip_address(ip).is_private
+    except ValueError:
+        return False
 
-@dataclass
+
+@dataclass(slots=True)
 class LateralDetection:
     src_ip: str
     targets: list[dict] = field(default_factory=list)  # [{ip, port, service, ts}]
@@ -35,7 +94,20 @@ class LateralDetection:
     mitre: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Flat record: build the dict directly rather than through asdict's recursive deepcopy
+        return {
+            "src_ip": self.src_ip,
+            "targets": [dict(t) for t in self.targets],
+            "target_count": self.target_count,
+            "services_used": list(self.services_used),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "timespan_minutes": self.timespan_minutes,
+            "risk_score": self.risk_score,
+            "risk_level": self.risk_level,
+            "pattern": self.pattern,
+            "mitre": list(self.mitre),
+        }
 
 
 class LateralMovementDetector:
@@ -46,162 +118,131 @@ class LateralMovementDetector:
         if connections is None:
             return self.detections
 
-        # Group by source IP
-        by_source: dict[str, list[dict]] = {}
+        # Accumulate per-source targets, service bitmask and time bounds in a
+        # single streaming pass (port check first: it is a dict lookup, while the
+        # internal-address checks parse both IPs)
+        by_source: dict[str, dict] = {}
         for conn in connections:
+            port = conn.get("dst_port", 0)
+            if port not in LATERAL_PORTS:
+                continue
             src = conn.get("src_ip", "")
             if not self._is_internal(src):
                 continue
             dst = conn.get("dst_ip", "")
             if not self._is_internal(dst):
                 continue
-            port = conn.get("dst_port", 0)
-            if port not in LATERAL_PORTS:
-                continue
-            by_source.setdefault(src, []).append(conn)
+
+            acc = by_source.get(src)
+            if acc is None:
+                acc = by_source[src] = {"targets": [], "unique": set(), "mask": 0, "first": "", "last": ""}
+            ts = conn.get("ts", "")
+            acc["targets"].append({"ip": dst, "port": port, "service": LATERAL_PORTS[port], "ts": ts})
+            acc["unique"].add(dst)
+            acc["mask"] |= _PORT_BITS[port]
+            # ISO-8601 strings order lexically, so no sort is needed for the bounds
+            if ts:
+                if not acc["first"] or ts < acc["first"]:
+                    acc["first"] = ts
+                if ts > acc["last"]:
+                    acc["last"] = ts
 
         detections = []
-        for src_ip, conns in by_source.items():
-            unique_targets = {c["dst_ip"] for c in conns}
+        for src_ip, acc in by_source.items():
+            unique_targets = acc["unique"]
             if len(unique_targets) < 2:
                 continue
 
-            services = list({LATERAL_PORTS.get(c["dst_port"], "Unknown") for c in conns})
-            timestamps = sorted(c.get("ts", "") for c in conns)
-            targets = [
-                {"ip": c["dst_ip"], "port": c["dst_port"],
-                 "service": LATERAL_PORTS.get(c["dst_port"], "Unknown"),
-                 "ts": c.get("ts", "")}
-                for c in conns
-            ]
+            targets = acc["targets"]
+            service_mask = acc["mask"]
+            first_ts = acc["first"]
+            last_ts = acc["last"]
 
             try:
-                first = datetime.fromisoformat(timestamps[0])
-                last = datetime.fromisoformat(timestamps[-1])
+                first = datetime.fromisoformat(first_ts)
+                last = datetime.fromisoformat(last_ts)
                 timespan = (last - first).total_seconds() / 60
-            except (ValueError, IndexError):
+            except ValueError:
                 timespan = 0
 
-            # Risk scoring
-            risk = 0.0
-            pattern_parts = []
-            mitre = []
+            services, service_risk, service_mitre = _SERVICE_PROFILES[service_mask]
 
-            # Multi-target
+            # Risk scoring, starting from the multi-target tier
             target_count = len(unique_targets)
-            if target_count >= 10:
-                risk += 40
-                pattern_parts.append("mass_scan")
-            elif target_count >= 5:
-                risk += 25
-                pattern_parts.append("multi_target")
-            else:
-                risk += 10
+            risk, target_pattern = next(
+                (points, pattern) for min_targets, points, pattern in TARGET_RISK_TIERS
+                if target_count >= min_targets
+            )
+            pattern_parts = [target_pattern] if target_pattern else []
 
             # Speed
             if timespan > 0 and target_count / (timespan + 0.01) > 0.5:
                 risk += 20
                 pattern_parts.append("rapid")
 
-            # Multiple services
+            # Multiple services and specific service risks (precomputed per service set)
             if len(services) >= 3:
-                risk += 15
                 pattern_parts.append("multi_service")
-                mitre.append("T1021 - Remote Services")
-
-            # Specific service risks
-            if "SMB" in services:
-                risk += 10
-                mitre.append("T1021.002 - SMB/Windows Admin Shares")
-            if "RDP" in services:
-                risk += 10
-                mitre.append("T1021.001 - Remote Desktop Protocol")
-            if "WMI/DCOM" in services:
-                risk += 15
-                mitre.append("T1047 - Windows Management Instrumentation")
-
-            if not mitre:
-                mitre.append("T1570 - Lateral Tool Transfer")
+            risk += service_risk
 
             risk = min(risk, 100)
-            if risk >= 70:
-                risk_level = "critical"
-            elif risk >= 50:
-                risk_level = "high"
-            elif risk >= 30:
-                risk_level = "medium"
-            else:
-                risk_level = "low"
+            risk_level = next(level for min_risk, level in RISK_LEVELS if risk >= min_risk)
 
             detection = LateralDetection(
                 src_ip=src_ip,
                 targets=targets,
                 target_count=target_count,
-                services_used=services,
-                first_seen=timestamps[0] if timestamps else "",
-                last_seen=timestamps[-1] if timestamps else "",
+                services_used=list(services),
+                first_seen=first_ts,
+                last_seen=last_ts,
                 timespan_minutes=round(timespan, 1),
                 risk_score=round(risk, 1),
                 risk_level=risk_level,
                 pattern="_".join(pattern_parts) if pattern_parts else "low_volume",
-                mitre=mitre,
+                mitre=list(service_mitre),
             )
             detections.append(detection)
 
-        self.detections = sorted(detections, key=lambda d: -d.risk_score)
+        self.detections = sorted(detections, key=attrgetter("risk_score"), reverse=True)
         return self.detections
 
     def get_stats(self) -> dict:
-        total = len(self.detections)
-        levels = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        total_hosts = set()
-        patterns = {}
-        for d in self.detections:
-            levels[d.risk_level] = levels.get(d.risk_level, 0) + 1
-            total_hosts.add(d.src_ip)
-            for t in d.targets:
-                total_hosts.add(t["ip"])
-            patterns[d.pattern] = patterns.get(d.pattern, 0) + 1
+        levels = Counter(d.risk_level for d in self.detections)
+        total_hosts = {d.src_ip for d in self.detections}
+        total_hosts.update(t["ip"] for d in self.detections for t in d.targets)
         return {
-            "total_detections": total,
+            "total_detections": len(self.detections),
             "hosts_involved": len(total_hosts),
-            "risk_levels": levels,
-            "patterns": patterns,
+            "risk_levels": {level: levels[level] for level in ("critical", "high", "medium", "low")},
+            "patterns": dict(Counter(d.pattern for d in self.detections)),
         }
 
     def _is_internal(self, ip: str) -> bool:
-        try:
-            return ipaddress.ip_address(ip).is_private
-        except ValueError:
-            return False
+        return _is_private_ip(ip)
 
-    def generate_demo_data(self) -> list[LateralDetection]:
+    def generate_demo_data(self, seed: int | None = None) -> list[LateralDetection]:
         now = datetime.now()
+        rng = np.random.default_rng(seed)
         connections = []
-        # Attacker doing mass scan
-        for _ in range(25):
-            connections.append({
-                "src_ip": "10.0.1.105",
-                "dst_ip": f"10.0.1.{random.randint(1,254)}",
-                "dst_port": random.choice([445, 3389, 135]),
-                "ts": (now - timedelta(minutes=random.randint(1, 30))).isoformat(),
-            })
-        # Moderate lateral movement
-        for _ in range(8):
-            connections.append({
-                "src_ip": "10.0.2.50",
-                "dst_ip": f"10.0.2.{random.choice([10,20,30,40,50])}",
-                "dst_port": random.choice([445, 22]),
-                "ts": (now - timedelta(minutes=random.randint(30, 120))).isoformat(),
-            })
-        # Normal admin
-        for _ in range(3):
-            connections.append({
-                "src_ip": "10.0.1.10",
-                "dst_ip": f"10.0.1.{random.choice([20,21])}",
-                "dst_port": 22,
-                "ts": (now - timedelta(minutes=random.randint(60, 480))).isoformat(),
-            })
+        # Cohorts: (src_ip, dst prefix, dst host choices, ports, minutes-ago range, count)
+        cohorts = [
+            ("10.0.1.105", "10.0.1", np.arange(1, 255), [445, 3389, 135], (1, 30), 25),  # Attacker doing mass scan
+            ("10.0.2.50", "10.0.2", [10, 20, 30, 40, 50], [445, 22], (30, 120), 8),  # Moderate lateral movement
+            ("10.0.1.10", "10.0.1", [20, 21], [22], (60, 480), 3),  # Normal admin
+        ]
+        for src_ip, prefix, hosts, ports, (min_ago, max_ago), count in cohorts:
+            dst_hosts = rng.choice(hosts, count).tolist()
+            dst_ports = rng.choice(ports, count).tolist()
+            minutes = rng.integers(min_ago, max_ago + 1, count).tolist()
+            connections.extend(
+                {
+                    "src_ip": src_ip,
+                    "dst_ip": f"{prefix}.{host}",
+                    "dst_port": port,
+                    "ts": (now - timedelta(minutes=minutes_ago)).isoformat(),
+                }
+                for host, port, minutes_ago in zip(dst_hosts, dst_ports, minutes)
+            )
 
         self.analyze(connections)
         return self.detections
@@ -4,8 +4,10 @@ Live PCAP Capture Service.
 Manages tcpdump/tshark capture sessions for real-time traffic analysis.
 Captures are written to temp files and ingested when stopped.
 """
+import mmap
 import os
 import signal
+import struct
 import subprocess
 import tempfile
 import logging
@@ -17,6 +19,39 @@ from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Classic libpcap magic numbers (microsecond and nanosecond timestamps)
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": "<", b"\x4d\x3c\xb2\xa1": "<",
+    b"\xa1\xb2\xc3\xd4": ">", b"\xa1\xb2\x3c\x4d": ">",
+}
+PCAP_GLOBAL_HEADER_LEN = 24
+PCAP_RECORD_HEADER_LEN = 16
+
+
+def _count_packets(path: str) -> int:
+    """Count records in a classic pcap file by striding over record headers.
+
+    Returns 0 for empty, pcapng or unrecognized files; a record truncated by
+    an interrupted capture is not counted.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < PCAP_GLOBAL_HEADER_LEN:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            byte_order = PCAP_MAGIC.get(mm[:4])
+            if byte_order is None:
+                return 0
+            incl_len = struct.Struct(byte_order + "I").unpack_from
+            count = 0
+            off = PCAP_GLOBAL_HEADER_LEN
+            while off + PCAP_RECORD_HEADER_LEN <= size:
+                off += PCAP_RECORD_HEADER_LEN + incl_len(mm, off + 8)[0]
+                if off > size:
+                    break
+                count += 1
+            return count
+
 
 @dataclass
 class CaptureSession:
@@ -37,11 +72,34 @@ class CaptureSession:
 class LiveCaptureService:
     """Manages live packet capture sessions."""
 
+    # Kernel capture ring size for tcpdump (-B, in KiB). libpcap already captures
+    # through a TPACKET_V3 mmap ring on Linux; its 2 MiB default drops packets
+    # under bursts, so give it 64 MiB.
+    CAPTURE_BUFFER_KIB = 65536
+
+    # Captures go to tmpfs (/dev/shm) when it has at least this much free space, so the
+    # pcap is written and re-read through memory only; small container /dev/shm
+    # mounts (64 MiB by default) fall back to the regular temp directory.
+    SHM_DIR = "/dev/shm"
+    SHM_MIN_FREE_BYTES = 1 << 30
+
     def __init__(self):
         self._sessions: Dict[str, CaptureSession] = {}
         self._processes: Dict[str, subprocess.Popen] = {}
         self._timers: Dict[str, threading.Timer] = {}
-        self._capture_dir = tempfile.mkdtemp(prefix="brohunter_capture_")
+        # Sessions whose process may still be alive; only these need polling
+        self._running_ids: set[str] = set()
+        self._capture_dir = tempfile.mkdtemp(prefix="brohunter_capture_", dir=self._capture_root())
+
+    def _capture_root(self) -> Optional[str]:
+        """Pick the parent directory for capture files (None = system temp dir)."""
+        try:
+            stat = os.statvfs(self.SHM_DIR)
+        except (OSError, AttributeError):
+            return None
+        if stat.f_bavail * stat.f_frsize < self.SHM_MIN_FREE_BYTES or not os.access(self.SHM_DIR, os.W_OK):
+            return None
+        return self.SHM_DIR
 
     def get_interfaces(self) -> list:
         """List available network interfaces."""
@@ -87,7 +145,10 @@ class LiveCaptureService:
         pcap_path = os.path.join(self._capture_dir, f"{session_id}.pcap")
 
         # Build tcpdump command
-        cmd = ["tcpdump", "-i", interface, "-w", pcap_path, "-c", str(max_packets)]
+        cmd = [
+            "tcpdump", "-i", interface, "-w", pcap_path, "-c", str(max_packets),
+            "-B", str(self.CAPTURE_BUFFER_KIB),
+        ]
         if capture_filter:
             cmd.extend(["--", capture_filter])
 
@@ -108,6 +169,7 @@ class LiveCaptureService:
             session.pid = proc.pid
             self._processes[session_id] = proc
             self._sessions[session_id] = session
+            self._running_ids.add(session_id)
             logger.info(f"Started capture {session_id} on {interface} (PID {proc.pid})")
 
             # Enforce max_seconds timeout
@@ -161,6 +223,7 @@ class LiveCaptureService:
 
         session.stopped_at = time.time()
         session.status = "stopped"
+        self._running_ids.discard(session_id)
 
         # Get file stats
         if os.path.exists(session.pcap_path):
@@ -168,14 +231,8 @@ class LiveCaptureService:
 
         # Try to get packet count
         try:
-            result = subprocess.run(
-                ["capinfos", "-c", session.pcap_path],
-                capture_output=True, text=True, timeout=10,
-            )
-            for line in result.stdout.split("\n"):
-                if "Number of packets" in line:
-                    session.packet_count = int(line.split(":")[-1].strip())
-        except Exception:
+            session.packet_count = _count_packets(session.pcap_path)
+        except (OSError, ValueError):
             pass
 
         return session
@@ -187,6 +244,7 @@ class LiveCaptureService:
             proc = self._processes.get(session_id)
             if proc and proc.poll() is not None:
                 session.status = "stopped"
+                self._running_ids.discard(session_id)
                 session.stopped_at = time.time()
                 if os.path.exists(session.pcap_path):
                     session.file_size_bytes = os.path.getsize(session.pcap_path)
@@ -194,8 +252,8 @@ class LiveCaptureService:
 
     def list_sessions(self) -> list:
         """List all capture sessions."""
-        # Update statuses
-        for sid in list(self._sessions.keys()):
+        # Update statuses; stopped sessions are final and need no polling
+        for sid in list(self._running_ids):
             self.get_session(sid)
         return list(self._sessions.values())
 
@@ -215,3 +273,4 @@ class LiveCaptureService:
             del self._processes[session_id]
         if session_id in self._sessions:
             del self._sessions[session_id]
+        self._running_ids.discard(session_id)
@@ -3,7 +3,10 @@ Live Operations service for Bro Hunter.
 Tracks real-time ingest state including timestamps, counters, and source statistics.
 """
 import logging
+from bisect import bisect_left
+from collections import deque
 from dataclasses import dataclass, field
+from itertools import islice
 from datetime import datetime, timezone
 from typing import Optional
 from threading import Lock
@@ -33,24 +36,37 @@ class LiveOpsState:
     
     # Status
     is_healthy: bool = True
-    
+
+    # ISO strings for the timestamps above, keyed by slot and reused while the
+    # timestamp object is unchanged (status polls far outnumber ingest batches)
+    _iso_cache: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def _iso(self, slot: str, value: Optional[datetime]) -> Optional[str]:
+        """Format a timestamp, reusing the previous string if it is the same object."""
+        if value is None:
+            return None
+        cached = self._iso_cache.get(slot)
+        if cached is None or cached[0] is not value:
+            cached = self._iso_cache[slot] = (value, value.isoformat())
+        return cached[1]
+
     def to_dict(self) -> dict:
         """Convert state to dictionary for API responses."""
         return {
             "zeek": {
                 "event_count": self.zeek_stats.event_count,
-                "last_ingest_at": self.zeek_stats.last_ingest_at.isoformat() if self.zeek_stats.last_ingest_at else None,
+                "last_ingest_at": self._iso("zeek", self.zeek_stats.last_ingest_at),
                 "bytes_received": self.zeek_stats.bytes_received,
                 "error_count": self.zeek_stats.error_count,
             },
             "suricata": {
                 "event_count": self.suricata_stats.event_count,
-                "last_ingest_at": self.suricata_stats.last_ingest_at.isoformat() if self.suricata_stats.last_ingest_at else None,
+                "last_ingest_at": self._iso("suricata", self.suricata_stats.last_ingest_at),
                 "bytes_received": self.suricata_stats.bytes_received,
                 "error_count": self.suricata_stats.error_count,
             },
             "total_events_ingested": self.total_events_ingested,
-            "last_event_at": self.last_event_at.isoformat() if self.last_event_at else None,
+            "last_event_at": self._iso("last_event", self.last_event_at),
             "is_healthy": self.is_healthy,
         }
 
@@ -64,8 +80,15 @@ class LiveOpsService:
     def __init__(self):
         self._state = LiveOpsState()
         self._lock = Lock()
-        self._recent_events: list[dict] = []
         self._max_recent_events = 10000  # Keep last 10k events in memory
+        # Bounded ring: appends evict the oldest event in O(1)
+        self._recent_events: deque[dict] = deque(maxlen=self._max_recent_events)
+        # Running maximum of event epoch timestamps, one entry per event appended; the
+        # last len(_recent_events) entries line up with the buffer. It is non-decreasing
+        # even when events arrive out of order, so `since` can bisect past the prefix
+        # that cannot contain a newer event. A list (trimmed in bulk) keeps indexing
+        # O(1) for the bisect, which a deque does not.
+        self._recent_max_ts: list[float] = []
     
     def record_zeek_ingest(self, event_count: int, bytes_received: int, errors: int = 0) -> None:
         """Record Zeek ingest batch."""
@@ -99,10 +122,14 @@ class LiveOpsService:
     def add_recent_event(self, event: dict) -> None:
         """Add an event to the recent events buffer."""
         with self._lock:
+            ts = event.get("timestamp")
+            latest = self._recent_max_ts[-1] if self._recent_max_ts else float("-inf")
+            if ts:
+                latest = max(latest, ts.timestamp())
             self._recent_events.append(event)
-            # Trim if exceeds max
-            if len(self._recent_events) > self._max_recent_events:
-                self._recent_events = self._recent_events[-self._max_recent_events:]
+            self._recent_max_ts.append(latest)
+            if len(self._recent_max_ts) >= 2 * self._max_recent_events:
+                del self._recent_max_ts[:-self._max_recent_events]
     
     def get_recent_events(self, since: Optional[datetime] = None, limit: int = 500) -> list[dict]:
         """
@@ -116,20 +143,24 @@ class LiveOpsService:
             List of event dictionaries
         """
         with self._lock:
-            events = self._recent_events
+            # Walk newest-first and stop once the limit is reached
+            events = reversed(self._recent_events)
             if since:
-                events = [
-                    e for e in events 
+                # Buffered events before `start` are all at or before `since`
+                offset = len(self._recent_max_ts) - len(self._recent_events)
+                start = bisect_left(self._recent_max_ts, since.timestamp(), offset) - offset
+                events = (
+                    e for e in islice(events, len(self._recent_events) - start)
                     if e.get("timestamp") and e.get("timestamp") > since
-                ]
-            # Return most recent first, limited
-            return events[-limit:][::-1]
+                )
+            return list(islice(events, limit))
     
     def reset(self) -> None:
         """Reset all state (useful for testing)."""
         with self._lock:
             self._state = LiveOpsState()
-            self._recent_events = []
+            self._recent_events.clear()
+            self._recent_max_ts.clear()
             logger.info("LiveOps state reset")
 
 
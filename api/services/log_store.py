@@ -3,11 +3,18 @@ In-memory log store service for Hunter.
 Provides efficient querying and filtering of parsed network logs.
 """
 from pathlib import Path
-from typing import Optional, Union
-from datetime import datetime
+from typing import Iterable, Iterator, Optional, Sequence, Union
+from datetime import datetime, timezone
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import mmap
+import os
+import sys
 
+import numpy as np
+
+from api.config import settings
 from api.parsers.zeek_parser import ZeekParser
 from api.parsers.suricata_parser import SuricataParser
 from api.parsers.unified import (
@@ -25,6 +32,83 @@ from api.models.suricata import SuricataAlert, SuricataFlow, SuricataDns
 
 logger = logging.getLogger(__name__)
 
+Record = Union[Connection, DnsQuery, Alert]
+
+
+def _normalize_entry(entry) -> Optional[Record]:
+    """Normalize a parsed Zeek/Suricata entry into a unified record (None if not stored)."""
+    if isinstance(entry, ConnLog):
+        return normalize_zeek_conn(entry)
+    if isinstance(entry, DnsLog):
+        return normalize_zeek_dns(entry)
+    if isinstance(entry, SuricataFlow):
+        return normalize_suricata_flow(entry)
+    if isinstance(entry, SuricataDns):
+        return normalize_suricata_dns(entry)
+    if isinstance(entry, SuricataAlert):
+        return normalize_suricata_alert(entry)
+    return None
+
+
+def _epoch_us(dt: datetime) -> int:
+    """
+    Datetime as integer microseconds since the epoch (exact for datetimes in this era).
+
+    Naive datetimes are taken as UTC, matching the timestamps the parsers produce.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return round(dt.timestamp() * 1_000_000)
+
+
+def _append_rows(buffer: Optional[np.ndarray], used: int, values: np.ndarray) -> np.ndarray:
+    """Write values after the first `used` slots of buffer, doubling its capacity when full."""
+    needed = used + len(values)
+    if buffer is None or needed > len(buffer):
+        capacity = max(needed, 2 * len(buffer) if buffer is not None else 0, 1024)
+        grown = np.empty(capacity, dtype=values.dtype)
+        if buffer is not None:
+            grown[:used] = buffer[:used]
+        buffer = grown
+    buffer[used:needed] = values
+    return buffer
+
+
+def _chunk_ranges(file_path: str, parts: int) -> list[tuple[int, int]]:
+    """Split a file into up to `parts` byte ranges that end on line boundaries."""
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            pos = mm.find(b"\n", max(size * i // parts, bounds[-1]))
+            if pos == -1:
+                break
+            bounds.append(pos + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _parse_range(file_path: str, start: int, end: int, log_type: Optional[str]) -> list[Record]:
+    """
+    Parse and normalize the lines in one byte range of a log file.
+
+    Runs in a worker process; log_type selects a Zeek log, None means Suricata eve.json.
+    """
+    records = []
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in mm[start:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if log_type is None:
+                entry = SuricataParser.parse_line(line)
+            else:
+                entry = ZeekParser.parse_line(line, log_type)
+            record = _normalize_entry(entry) if entry is not None else None
+            if record is not None:
+                records.append(record)
+    return records
+
 
 class LogStore:
     """
@@ -32,6 +116,10 @@ class LogStore:
     Stores connections, DNS queries, and alerts with efficient filtering.
     """
 
+    # Files at least this large are split on line boundaries and parsed in a process pool
+    PARALLEL_PARSE_MIN_BYTES = 64 * 1024 * 1024
+    PARSE_WORKERS = os.cpu_count() or 1
+
     def __init__(self):
         """Initialize empty log store."""
         self.connections: list[Connection] = []
@@ -44,9 +132,24 @@ class LogStore:
         self.min_timestamp: Optional[datetime] = None
         self.max_timestamp: Optional[datetime] = None
 
+        # Bumped on every mutation so consumers can tell when derived caches are stale
+        self.version = 0
+
         # Index for fast IP lookups
         self._src_ip_index: dict[str, list[int]] = defaultdict(list)
         self._dst_ip_index: dict[str, list[int]] = defaultdict(list)
+        self._pair_index: dict[tuple[str, str], list[int]] = defaultdict(list)
+        self._port_index: dict[int, list[int]] = defaultdict(list)
+
+        # One shared string object per distinct IP address (connections and DNS queries)
+        self._ip_interner: dict[str, str] = {}
+
+        # Columnar copy of connection fields for vectorized filtering, extended on demand
+        self._conn_columns: Optional[dict[str, np.ndarray]] = None
+        self._conn_codes: dict[str, dict[Optional[str], int]] = {}
+        self._conn_buffers: dict[str, np.ndarray] = {}
+        self._conn_built = 0
+        self._conn_source: Optional[list[Connection]] = None
 
     def clear(self):
         """Clear all stored logs."""
@@ -55,11 +158,19 @@ class LogStore:
         self.alerts.clear()
         self._src_ip_index.clear()
         self._dst_ip_index.clear()
+        self._pair_index.clear()
+        self._port_index.clear()
+        self._ip_interner.clear()
+        self._conn_columns = None
+        self._conn_codes = {}
+        self._conn_buffers = {}
+        self._conn_built = 0
 
         self.file_count = 0
         self.total_records = 0
         self.min_timestamp = None
         self.max_timestamp = None
+        self.version += 1
 
         logger.info("Log store cleared")
 
@@ -92,28 +203,30 @@ class LogStore:
         self.clear()
 
         files_processed = 0
-        records_loaded = 0
 
-        # Find all log files
-        zeek_files = list(directory_path.glob("*.log.json")) + list(directory_path.glob("*.log"))
-        suricata_files = list(directory_path.glob("eve.json"))
+        # Find all log files in one directory pass, in a deterministic order
+        zeek_files: list[Path] = []
+        suricata_files: list[Path] = []
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith((".log.json", ".log")):
+                    target = zeek_files
+                elif name == "eve.json":
+                    target = suricata_files
+                else:
+                    continue
+                if entry.is_file():
+                    target.append(Path(entry.path))
+        zeek_files.sort()
 
         # Process Zeek logs
         for file_path in zeek_files:
             try:
                 log_type = ZeekParser.detect_log_type(file_path.name)
 
-                if log_type == "conn":
-                    for entry in ZeekParser.parse_file(file_path, log_type="conn"):
-                        conn = normalize_zeek_conn(entry)
-                        self._add_connection(conn)
-                        records_loaded += 1
-
-                elif log_type == "dns":
-                    for entry in ZeekParser.parse_file(file_path, log_type="dns"):
-                        query = normalize_zeek_dns(entry)
-                        self._add_dns_query(query)
-                        records_loaded += 1
+                if log_type in ("conn", "dns"):
+                    self._add_records(self._parse_records(file_path, log_type))
 
                 # Other Zeek log types can be added here as needed
                 else:
@@ -130,21 +243,7 @@ class LogStore:
         # Process Suricata logs
         for file_path in suricata_files:
             try:
-                for entry in SuricataParser.parse_file(file_path):
-                    if isinstance(entry, SuricataFlow):
-                        conn = normalize_suricata_flow(entry)
-                        self._add_connection(conn)
-                        records_loaded += 1
-
-                    elif isinstance(entry, SuricataDns):
-                        query = normalize_suricata_dns(entry)
-                        self._add_dns_query(query)
-                        records_loaded += 1
-
-                    elif isinstance(entry, SuricataAlert):
-                        alert = normalize_suricata_alert(entry)
-                        self._add_alert(alert)
-                        records_loaded += 1
+                self._add_records(self._parse_records(file_path))
 
                 files_processed += 1
                 logger.info(f"Loaded {file_path.name}: suricata")
@@ -153,6 +252,8 @@ class LogStore:
                 logger.error(f"Error loading {file_path}: {e}")
                 continue
 
+        # The store was cleared above, so everything in it came from this load
+        records_loaded = len(self.connections) + len(self.dns_queries) + len(self.alerts)
         self.file_count = files_processed
         self.total_records = records_loaded
 
@@ -175,26 +276,132 @@ class LogStore:
             "alerts": len(self.alerts),
         }
 
+    def _parse_records(self, file_path: Path, log_type: Optional[str] = None) -> Iterator[Record]:
+        """
+        Parse a Zeek log (log_type given) or Suricata eve.json into normalized records.
+
+        Small files stream through the parser in this process. Large files are
+        split into line-aligned byte ranges parsed in parallel; results are
+        yielded in file order. The parallel path logs and skips bad lines
+        without the parser's max_errors cutoff.
+        """
+        workers = self.PARSE_WORKERS
+        if workers <= 1 or file_path.stat().st_size < self.PARALLEL_PARSE_MIN_BYTES:
+            if log_type is None:
+                entries = SuricataParser.parse_file(file_path, buffer_size=settings.parse_bufsize)
+            else:
+                entries = ZeekParser.parse_file(
+                    file_path, log_type=log_type, buffer_size=settings.parse_bufsize
+                )
+            for entry in entries:
+                record = _normalize_entry(entry)
+                if record is not None:
+                    yield record
+            return
+
+        path = str(file_path)
+        ranges = _chunk_ranges(path, workers)
+        logger.info(f"Parsing {file_path.name} in {len(ranges)} parallel chunks")
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(_parse_range, path, start, end, log_type)
+                for start, end in ranges
+            ]
+            for future in futures:
+                yield from future.result()
+
+    def _add_records(self, records: Iterable[Record]):
+        """
+        Add normalized records to their collections.
+
+        Connections are gathered and indexed as one batch; whatever was read is
+        still added if the record stream fails part way through.
+        """
+        connections = []
+        try:
+            for record in records:
+                if isinstance(record, Connection):
+                    connections.append(record)
+                elif isinstance(record, DnsQuery):
+                    self._add_dns_query(record)
+                else:
+                    self._add_alert(record)
+        finally:
+            self._extend_connections(connections)
+
     def _add_connection(self, conn: Connection):
         """Add connection to store and update indices."""
-        idx = len(self.connections)
-        self.connections.append(conn)
+        self._extend_connections((conn,))
 
-        # Update IP indices
-        self._src_ip_index[conn.src_ip].append(idx)
-        self._dst_ip_index[conn.dst_ip].append(idx)
+    def _extend_connections(self, conns: Sequence[Connection]):
+        """
+        Append connections and update indices and the time range in one pass.
 
-        # Update timestamp range
-        self._update_time_range(conn.timestamp)
+        The batch is appended with a single extend (one exact-size resize), and
+        stores, indices and helpers are bound to locals once per batch instead
+        of being looked up for every row.
+        """
+        connections = self.connections
+        start = len(connections)
+        connections.extend(conns)
+        self.version += 1
+        interner = self._ip_interner
+        intern = sys.intern
+        set_field = object.__setattr__  # plain field store, skipping BaseModel.__setattr__
+        src_index = self._src_ip_index
+        dst_index = self._dst_ip_index
+        pair_index = self._pair_index
+        port_index = self._port_index
+        min_ts = self.min_timestamp
+        max_ts = self.max_timestamp
+
+        for idx, conn in enumerate(conns, start):
+            # Dedupe repeated strings so rows share one object per value and
+            # comparisons against the index keys short-circuit on identity
+            src_ip = interner.setdefault(conn.src_ip, conn.src_ip)
+            dst_ip = interner.setdefault(conn.dst_ip, conn.dst_ip)
+            set_field(conn, "src_ip", src_ip)
+            set_field(conn, "dst_ip", dst_ip)
+            set_field(conn, "proto", intern(conn.proto))
+            if conn.service is not None:
+                set_field(conn, "service", intern(conn.service))
+
+            # Update IP, IP-pair and port indices
+            src_index[src_ip].append(idx)
+            dst_index[dst_ip].append(idx)
+            pair_index[(src_ip, dst_ip)].append(idx)
+            src_port = conn.src_port
+            port_index[src_port].append(idx)
+            if conn.dst_port != src_port:
+                port_index[conn.dst_port].append(idx)
+
+            # Update timestamp range
+            ts = conn.timestamp
+            if min_ts is None or ts < min_ts:
+                min_ts = ts
+            if max_ts is None or ts > max_ts:
+                max_ts = ts
+
+        self.min_timestamp = min_ts
+        self.max_timestamp = max_ts
 
     def _add_dns_query(self, query: DnsQuery):
         """Add DNS query to store."""
+        interner = self._ip_interner
+        set_field = object.__setattr__  # plain field store, skipping BaseModel.__setattr__
+        set_field(query, "src_ip", interner.setdefault(query.src_ip, query.src_ip))
+        set_field(query, "dst_ip", interner.setdefault(query.dst_ip, query.dst_ip))
+        if query.qtype is not None:
+            set_field(query, "qtype", sys.intern(query.qtype))
+
         self.dns_queries.append(query)
+        self.version += 1
         self._update_time_range(query.timestamp)
 
     def _add_alert(self, alert: Alert):
         """Add alert to store."""
         self.alerts.append(alert)
+        self.version += 1
         self._update_time_range(alert.timestamp)
 
     def _update_time_range(self, timestamp: datetime):
@@ -242,27 +449,20 @@ class LogStore:
         elif dst_ip and not any([src_ip, port, proto, service, min_duration, time_start, time_end]):
             indices = self._dst_ip_index.get(dst_ip, [])
             results = [self.connections[i] for i in indices]
+        elif any([src_ip, dst_ip, port, proto, service, time_start, time_end]) or min_duration is not None:
+            # Full scan: evaluate filters as array masks, materialize only the selected rows
+            rows = self._connection_rows(
+                src_ip, dst_ip, port, proto, service, min_duration, time_start, time_end,
+            )
+            if offset:
+                rows = rows[offset:]
+            if limit:
+                rows = rows[:limit]
+            connections = self.connections
+            return [connections[i] for i in rows.tolist()]
         else:
-            # Full scan with filters
             results = self.connections
 
-            if src_ip:
-                results = [c for c in results if c.src_ip == src_ip]
-            if dst_ip:
-                results = [c for c in results if c.dst_ip == dst_ip]
-            if port:
-                results = [c for c in results if c.src_port == port or c.dst_port == port]
-            if proto:
-                results = [c for c in results if c.proto == proto.lower()]
-            if service:
-                results = [c for c in results if c.service == service]
-            if min_duration is not None:
-                results = [c for c in results if c.duration and c.duration >= min_duration]
-            if time_start:
-                results = [c for c in results if c.timestamp >= time_start]
-            if time_end:
-                results = [c for c in results if c.timestamp <= time_end]
-
         # Apply pagination
         if offset:
             results = results[offset:]
@@ -271,6 +471,121 @@ class LogStore:
 
         return results
 
+    def _connection_columns(self) -> dict[str, np.ndarray]:
+        """
+        Struct-of-arrays view of the non-indexed connection fields used by get_connections filters.
+
+        String fields are stored as int32 category codes (see _conn_codes), durations
+        as float64 with NaN for missing, timestamps as int64 epoch microseconds.
+        ts_order/ts_sorted hold a stable timestamp sort for time-window lookups.
+        Connections are append-only between clear() calls, so rows added since the
+        last call are appended to growable buffers and merged into the timestamp
+        sort; the view is rebuilt from scratch only if the list itself is replaced.
+        """
+        connections = self.connections
+        n = len(connections)
+        if connections is not self._conn_source or n < self._conn_built:
+            self._conn_source = connections
+            self._conn_built = 0
+            self._conn_buffers = {}
+            self._conn_codes = {}
+        built = self._conn_built
+        if built == n and self._conn_columns is not None:
+            return self._conn_columns
+
+        proto_codes = self._conn_codes.setdefault("proto", {})
+        service_codes = self._conn_codes.setdefault("service", {})
+        tail = connections[built:]
+        k = len(tail)
+
+        def codes(table: dict, values) -> np.ndarray:
+            return np.fromiter((table.setdefault(v, len(table)) for v in values), np.int32, k)
+
+        added = {
+            "proto": codes(proto_codes, (c.proto for c in tail)),
+            "service": codes(service_codes, (c.service for c in tail)),
+            "duration": np.fromiter(
+                (np.nan if c.duration is None else c.duration for c in tail), np.float64, k
+            ),
+            "timestamp": np.fromiter((_epoch_us(c.timestamp) for c in tail), np.int64, k),
+        }
+        # Logs are usually already time-ordered, which the stable sort handles quickly
+        tail_order = np.argsort(added["timestamp"], kind="stable")
+        tail_sorted = added["timestamp"][tail_order]
+        tail_order += built
+
+        buffers = self._conn_buffers
+        for name, values in added.items():
+            buffers[name] = _append_rows(buffers.get(name), built, values)
+        if built == 0 or k == 0 or tail_sorted[0] >= buffers["ts_sorted"][built - 1]:
+            # In-order tail (the live-ingest case): the sort just extends
+            buffers["ts_order"] = _append_rows(buffers.get("ts_order"), built, tail_order)
+            buffers["ts_sorted"] = _append_rows(buffers.get("ts_sorted"), built, tail_sorted)
+        else:
+            # Insert after equal timestamps so earlier rows keep sorting first
+            at = np.searchsorted(buffers["ts_sorted"][:built], tail_sorted, "right")
+            merged_order = np.insert(buffers["ts_order"][:built], at, tail_order)
+            merged_sorted = np.insert(buffers["ts_sorted"][:built], at, tail_sorted)
+            buffers["ts_order"] = _append_rows(buffers["ts_order"], 0, merged_order)
+            buffers["ts_sorted"] = _append_rows(buffers["ts_sorted"], 0, merged_sorted)
+
+        self._conn_built = n
+        self._conn_columns = {name: buffer[:n] for name, buffer in buffers.items()}
+        return self._conn_columns
+
+    def _connection_rows(
+        self,
+        src_ip: Optional[str],
+        dst_ip: Optional[str],
+        port: Optional[int],
+        proto: Optional[str],
+        service: Optional[str],
+        min_duration: Optional[float],
+        time_start: Optional[datetime],
+        time_end: Optional[datetime],
+    ) -> np.ndarray:
+        """Indices (in insertion order) of connections matching the get_connections filters."""
+        cols = self._connection_columns()
+        codes = self._conn_codes
+
+        # IP, port and time predicates resolve to sorted row-id sets from the indices
+        # and the timestamp sort; intersect them smallest-first
+        candidates = []
+        if src_ip and dst_ip:
+            candidates.append(self._pair_index.get((src_ip, dst_ip), []))
+        elif src_ip:
+            candidates.append(self._src_ip_index.get(src_ip, []))
+        elif dst_ip:
+            candidates.append(self._dst_ip_index.get(dst_ip, []))
+        if port:
+            candidates.append(self._port_index.get(port, []))
+        if time_start or time_end:
+            ts_sorted = cols["ts_sorted"]
+            lo = np.searchsorted(ts_sorted, _epoch_us(time_start), "left") if time_start else 0
+            hi = np.searchsorted(ts_sorted, _epoch_us(time_end), "right") if time_end else len(ts_sorted)
+            candidates.append(np.sort(cols["ts_order"][lo:hi]))
+
+        rows = None
+        for ids in sorted(candidates, key=len):
+            ids = np.asarray(ids, dtype=np.intp)
+            rows = ids if rows is None else np.intersect1d(rows, ids, assume_unique=True)
+
+        def col(name: str) -> np.ndarray:
+            return cols[name] if rows is None else cols[name][rows]
+
+        # Remaining predicates are evaluated over the candidates only
+        mask = np.ones(len(self.connections) if rows is None else len(rows), dtype=bool)
+        if proto:
+            mask &= col("proto") == codes["proto"].get(proto.lower(), -1)
+        if service:
+            mask &= col("service") == codes["service"].get(service, -1)
+        if min_duration is not None:
+            # Missing (NaN) and zero durations never match, as with the truthiness check they replace
+            duration = col("duration")
+            mask &= (duration != 0) & (duration >= min_duration)
+
+        return np.flatnonzero(mask) if rows is None else rows[mask]
+
     def get_dns_queries(
         self,
         src_ip: Optional[str] = None,
@@ -297,8 +612,10 @@ class LogStore:
         if src_ip:
             results = [q for q in results if q.src_ip == src_ip]
         if query:
-            results = [q for q in results if query.lower() in q.query.lower()]
+            needle = query.lower()
+            results = [q for q in results if needle in q.query_lc]
         if qtype:
+            qtype = qtype.upper()
             results = [q for q in results if q.qtype == qtype]
 
         # Apply pagination
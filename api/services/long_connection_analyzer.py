@@ -14,9 +14,12 @@ Scoring methodology:
 - Destination reputation (external IPs, unusual ports)
 """
 
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
 
 from api.parsers.unified import Connection
 from api.models.threat import ThreatLevel, MitreMapping
@@ -65,16 +68,108 @@ PROTOCOL_DURATION_THRESHOLDS = {
     "default": 1800,  # 30 minutes
 }
 
+# Destination ports expected to carry long-lived or well-known traffic
+STANDARD_PORTS = frozenset({
+    20, 21, 22, 23, 25, 53, 80, 110, 143, 443,
+    3306, 3389, 5432, 8080, 8443,
+})
+WEB_PORTS = (80, 443, 8080, 8443)
+
+# Duration score by how many times over its protocol threshold a connection ran:
+# below the threshold, then [1x, 2x), [2x, 3x), [3x, 5x), [5x, 10x), 10x and up
+DURATION_RATIO_CUTOFFS = (2.0, 3.0, 5.0, 10.0)
+DURATION_SCORE_TABLE = (0.0, 20.0, 40.0, 60.0, 80.0, 100.0)
+
 # Bytes per second thresholds for sustained transfer
 SUSTAINED_TRANSFER_THRESHOLD = 1024  # 1 KB/s minimum for exfil
 
-# Private IP ranges (RFC 1918)
-PRIVATE_IP_RANGES = [
-    ("10.0.0.0", "10.255.255.255"),
-    ("172.16.0.0", "172.31.255.255"),
-    ("192.168.0.0", "192.168.255.255"),
-    ("127.0.0.0", "127.255.255.255"),
-]
+# Private IP ranges (RFC 1918 + loopback) as (network, netmask) over the 32-bit address
+PRIVATE_IP_NETWORKS = (
+    (0x0A000000, 0xFF000000),  # 10.0.0.0/8
+    (0xAC100000, 0xFFF00000),  # 172.16.0.0/12
+    (0xC0A80000, 0xFFFF0000),  # 192.168.0.0/16
+    (0x7F000000, 0xFF000000),  # 127.0.0.0/8
+)
+
+
+@lru_cache(maxsize=4096)
+def _ip_to_u32(ip: str) -> Optional[int]:
+    """Dotted-quad IPv4 address as a 32-bit int; None for anything else (IPv6, malformed)."""
+    parts = ip.split(".")
+    if len(parts) != 4:
+        return None
+    try:
+        a, b, c, d = (int(p) for p in parts)
+    except ValueError:
+        return None
+    if not (0 <= a <= 255 and 0 <= b <= 255 and 0 <= c <= 255 and 0 <= d <= 255):
+        return None
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def _service_threshold(service_lc: str) -> float:
+    """Duration threshold for a lowercased service name ("" when unknown)."""
+    return PROTOCOL_DURATION_THRESHOLDS.get(service_lc or "default", PROTOCOL_DURATION_THRESHOLDS["default"])
+
+
+def _port_table(ports) -> np.ndarray:
+    """Boolean lookup table over the 16-bit port space, True for the given ports."""
+    table = np.zeros(1 << 16, dtype=bool)
+    table[list(ports)] = True
+    return table
+
+
+def _in_port_table(table: np.ndarray, ports: np.ndarray) -> np.ndarray:
+    """Vectorized membership test; values outside 0-65535 are never members."""
+    return np.where((ports >= 0) & (ports <= 0xFFFF), table[ports & 0xFFFF], False)
+
+
+_STANDARD_PORT_TABLE = _port_table(STANDARD_PORTS)
+_WEB_PORT_TABLE = _port_table(WEB_PORTS)
+
+
+# Observed-behavior text for each technique _map_to_mitre can report
+_TECH_TO_BEHAVIORS: Dict[str, Tuple[str, ...]] = {
+    "T1029": (),
+    "T1030": ("Small consistent data transfers (covert channel)",),
+    "T1041": ("Sustained outbound data transfer",),
+    "T1048": ("Sustained outbound data transfer",),
+    "T1071": ("Long-duration application layer connection",),
+    "T1071.001": ("Long-duration application layer connection",),
+    "T1071.004": ("Long-duration application layer connection",),
+}
+
+
+@lru_cache(maxsize=None)
+def _technique_profile(tech_id: str) -> Optional[Tuple[str, str, str, Tuple[str, ...]]]:
+    """
+    Mapping fields that depend only on the technique id.
+
+    Returns (technique name, primary tactic name, primary tactic id,
+    observed behaviors), or None for ids the framework does not know.
+    """
+    technique = mitre_framework.get_technique(tech_id)
+    if not technique:
+        return None
+
+    tactics = mitre_framework.get_tactics_for_technique(tech_id)
+    tactic = tactics[0] if tactics else None
+    return (
+        technique.name,
+        tactic.name if tactic else "Unknown",
+        tactic.tactic_id if tactic else "Unknown",
+        _TECH_TO_BEHAVIORS.get(tech_id, ()),
+    )
+
+
+def _weighted_score(duration_score, transfer_score, protocol_score, destination_score):
+    """Weighted total score (0-100) from the component scores; scalars or arrays."""
+    return (
+        duration_score * 0.30 +
+        transfer_score * 0.35 +
+        protocol_score * 0.20 +
+        destination_score * 0.15
+    )
 
 
 class LongConnectionAnalyzer:
@@ -123,23 +218,144 @@ class LongConnectionAnalyzer:
         Returns:
             List of suspicious long connections with scores
         """
-        results = []
-
-        for conn in connections:
-            # Skip if duration is None or too short
-            if not conn.duration or conn.duration < self.min_duration:
-                continue
-
-            result = self._analyze_connection(conn)
-            if result and result.score >= self.min_score_threshold:
-                results.append(result)
+        # Skip if duration is None or too short
+        min_duration = self.min_duration
+        candidates = [c for c in connections if c.duration and c.duration >= min_duration]
+        if not candidates:
+            return []
+
+        # Score every candidate with array ops; build full results only for those
+        # that reach the threshold
+        components = self._score_candidates(candidates)
+        keep = np.flatnonzero(_weighted_score(*components) >= self.min_score_threshold)
+        kept_components = np.column_stack(components)[keep].tolist()
+        results = [
+            self._analyze_connection(candidates[i], *scores)
+            for i, scores in zip(keep.tolist(), kept_components)
+        ]
 
         # Sort by score descending
         results.sort(key=lambda x: x.score, reverse=True)
         return results
 
-    def _analyze_connection(self, conn: Connection) -> LongConnectionResult:
-        """Analyze a single long connection."""
+    def _vectorize(self, connections: List[Connection]) -> Dict[str, np.ndarray]:
+        """
+        Struct-of-arrays view of the fields the scorers read.
+
+        Lowercased services are mapped to small ids; service-derived
+        properties come back as lookup arrays indexed by id.
+        """
+        n = len(connections)
+        service_ids: Dict[str, int] = {}
+
+        def service_id(service_lc: str) -> int:
+            return service_ids.setdefault(service_lc, len(service_ids))
+
+        cols = {
+            "duration": np.fromiter((c.duration for c in connections), np.float64, n),
+            "bytes_sent": np.fromiter((c.bytes_sent or 0 for c in connections), np.int64, n),
+            "bytes_recv": np.fromiter((c.bytes_recv or 0 for c in connections), np.int64, n),
+            "dst_port": np.fromiter((c.dst_port for c in connections), np.int64, n),
+            "svc_id": np.fromiter((service_id(c.service_lc) for c in connections), np.intp, n),
+            # -1 marks destinations that are not IPv4 (never private)
+            "dst_u32": np.fromiter(
+                (-1 if (u := _ip_to_u32(c.dst_ip)) is None else u for c in connections), np.int64, n
+            ),
+        }
+        dst_u32 = cols["dst_u32"]
+        is_private = np.zeros(n, dtype=bool)
+        for network, netmask in PRIVATE_IP_NETWORKS:
+            is_private |= (dst_u32 & netmask) == network
+        cols["is_private"] = is_private & (dst_u32 >= 0)
+
+        services = list(service_ids)
+        cols["svc_threshold"] = np.array([_service_threshold(s) for s in services], dtype=np.float64)
+        cols["svc_dns"] = np.array([s == "dns" for s in services], dtype=bool)
+        cols["svc_web"] = np.array([s in ("http", "https") for s in services], dtype=bool)
+        cols["svc_ssh"] = np.array([s == "ssh" for s in services], dtype=bool)
+        return cols
+
+    def _score_candidates(
+        self, connections: List[Connection]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Component scores for each connection, computed column-wise.
+
+        Returns (duration, transfer pattern, protocol context, destination)
+        score arrays. This is the only implementation of the scoring rules;
+        _analyze_connection receives its row of these scores.
+        """
+        cols = self._vectorize(connections)
+        duration = cols["duration"]
+        bytes_sent = cols["bytes_sent"]
+        bytes_recv = cols["bytes_recv"]
+        dst_port = cols["dst_port"]
+        svc_id = cols["svc_id"]
+        total_bytes = bytes_sent + bytes_recv
+        positive = duration > 0
+
+        def per_second(values: np.ndarray) -> np.ndarray:
+            return np.divide(values, duration, out=np.zeros(len(duration)), where=positive)
+
+        bytes_per_second = per_second(total_bytes)
+        upload_rate = per_second(bytes_sent)
+
+        # Duration relative to the protocol threshold
+        threshold = cols["svc_threshold"][svc_id]
+        bucket = np.searchsorted(DURATION_RATIO_CUTOFFS, duration / threshold, side="right") + 1
+        duration_score = np.asarray(DURATION_SCORE_TABLE)[np.where(duration < threshold, 0, bucket)]
+
+        # Transfer pattern
+        transfer_score = np.select(
+            [upload_rate >= 1024 * 1024, upload_rate >= 100 * 1024, upload_rate >= 10 * 1024, upload_rate >= 1024],
+            [40.0, 30.0, 20.0, 10.0],
+            0.0,
+        )
+        transfer_score += np.where((bytes_per_second > 0) & (bytes_per_second < 100) & (duration > 1800), 30.0, 0.0)
+        transfer_score += np.select(
+            [total_bytes >= 100 * 1024 * 1024, total_bytes >= 10 * 1024 * 1024], [20.0, 10.0], 0.0
+        )
+        both = (bytes_sent > 0) & (bytes_recv > 0)
+        imbalance = np.divide(
+            np.maximum(bytes_sent, bytes_recv), np.minimum(bytes_sent, bytes_recv),
+            out=np.zeros(len(duration)), where=both,
+        )
+        transfer_score += np.where(both & (imbalance >= 10), 10.0, 0.0)
+        transfer_score = np.minimum(transfer_score, 100.0)
+
+        # Protocol context: the first matching branch wins, as in the if/elif chain
+        is_dns = cols["svc_dns"][svc_id] | (dst_port == 53)
+        is_web = ~is_dns & (cols["svc_web"][svc_id] | _in_port_table(_WEB_PORT_TABLE, dst_port))
+        is_ssh = ~is_dns & ~is_web & (cols["svc_ssh"][svc_id] | (dst_port == 22))
+        is_ephemeral = ~is_dns & ~is_web & ~is_ssh & (dst_port > 49152)
+        protocol_score = np.select(
+            [
+                is_dns & (duration > 60), is_dns & (duration > 10), is_dns & (duration > 5),
+                is_web & (duration > 3600), is_web & (duration > 1800), is_web & (duration > 900),
+                is_ssh & (duration > 3600) & (bytes_sent > 10 * 1024 * 1024),
+                is_ephemeral,
+            ],
+            [90.0, 70.0, 50.0, 60.0, 40.0, 20.0, 50.0, 20.0],
+            0.0,
+        )
+
+        # Destination
+        destination_score = np.where(cols["is_private"], 0.0, 50.0)
+        destination_score += np.where(_in_port_table(_STANDARD_PORT_TABLE, dst_port), 0.0, 30.0)
+        destination_score += np.where(dst_port > 49152, 20.0, 0.0)
+        destination_score = np.minimum(destination_score, 100.0)
+
+        return duration_score, transfer_score, protocol_score, destination_score
+
+    def _analyze_connection(
+        self,
+        conn: Connection,
+        duration_score: float,
+        transfer_score: float,
+        protocol_score: float,
+        destination_score: float,
+    ) -> LongConnectionResult:
+        """Analyze a single long connection given its component scores."""
         duration = conn.duration or 0.0
         bytes_sent = conn.bytes_sent or 0
         bytes_recv = conn.bytes_recv or 0
@@ -150,31 +366,18 @@ class LongConnectionAnalyzer:
         is_bidirectional = bytes_sent > 0 and bytes_recv > 0
         data_ratio = bytes_sent / bytes_recv if bytes_recv > 0 else float('inf')
 
-        # Component scores
-        duration_score = self._score_duration(conn, duration)
-        transfer_score = self._score_transfer_pattern(
-            bytes_sent, bytes_recv, bytes_per_second, duration
-        )
-        protocol_score = self._score_protocol_context(conn, duration)
-        destination_score = self._score_destination(conn)
-
         # Weighted total score (0-100)
-        total_score = (
-            duration_score * 0.30 +
-            transfer_score * 0.35 +
-            protocol_score * 0.20 +
-            destination_score * 0.15
-        )
+        total_score = _weighted_score(duration_score, transfer_score, protocol_score, destination_score)
 
         # Confidence based on data completeness
-        confidence = self._calculate_confidence(conn, bytes_per_second)
+        confidence = self._calculate_confidence(conn, total_bytes, bytes_per_second)
 
         # Threat level
         threat_level = self._score_to_threat_level(total_score)
 
         # Reasons (explainability)
         reasons = self._build_reasons(
-            conn, duration, bytes_per_second,
+            conn, duration, bytes_sent, bytes_per_second,
             duration_score, transfer_score, protocol_score, destination_score
         )
 
@@ -188,7 +391,7 @@ class LongConnectionAnalyzer:
             conn, duration, bytes_sent, bytes_recv, bytes_per_second
         )
         mitre_mappings = self._build_mitre_mappings(
-            conn, mitre_techniques, confidence, indicators
+            conn, mitre_techniques, confidence, duration, bytes_sent, bytes_recv
         )
 
         return LongConnectionResult(
@@ -206,189 +409,23 @@ class LongConnectionAnalyzer:
             data_ratio=data_ratio,
         )
 
-    def _score_duration(self, conn: Connection, duration: float) -> float:
-        """
-        Score based on connection duration relative to protocol expectations.
-
-        Longer connections are more suspicious for certain protocols (HTTP, DNS).
-        """
-        service = (conn.service or "default").lower()
-        threshold = PROTOCOL_DURATION_THRESHOLDS.get(
-            service,
-            PROTOCOL_DURATION_THRESHOLDS["default"]
-        )
-
-        if duration < threshold:
-            return 0.0
-
-        # Score increases with duration beyond threshold
-        ratio = duration / threshold
-        if ratio >= 10:
-            return 100.0
-        elif ratio >= 5:
-            return 80.0
-        elif ratio >= 3:
-            return 60.0
-        elif ratio >= 2:
-            return 40.0
-        else:
-            return 20.0
-
-    def _score_transfer_pattern(
-        self,
-        bytes_sent: int,
-        bytes_recv: int,
-        bytes_per_second: float,
-        duration: float,
-    ) -> float:
-        """
-        Score based on data transfer characteristics.
-
-        Suspicious patterns:
-        - High sustained upload (exfiltration)
-        - Very low but continuous transfer (covert channel)
-        - Imbalanced bidirectional (asymmetric exfil)
-        """
-        score = 0.0
-
-        # High sustained upload (exfiltration)
-        upload_rate = bytes_sent / duration if duration > 0 else 0
-        if upload_rate >= 1024 * 1024:  # 1 MB/s
-            score += 40.0
-        elif upload_rate >= 100 * 1024:  # 100 KB/s
-            score += 30.0
-        elif upload_rate >= 10 * 1024:  # 10 KB/s
-            score += 20.0
-        elif upload_rate >= 1024:  # 1 KB/s
-            score += 10.0
-
-        # Very low but continuous transfer (covert channel)
-        if 0 < bytes_per_second < 100 and duration > 1800:  # < 100 bytes/sec for 30+ min
-            score += 30.0
-
-        # Large total transfer
-        total_bytes = bytes_sent + bytes_recv
-        if total_bytes >= 100 * 1024 * 1024:  # 100 MB
-            score += 20.0
-        elif total_bytes >= 10 * 1024 * 1024:  # 10 MB
-            score += 10.0
-
-        # Imbalanced bidirectional (one-way heavy)
-        if bytes_sent > 0 and bytes_recv > 0:
-            ratio = max(bytes_sent, bytes_recv) / min(bytes_sent, bytes_recv)
-            if ratio >= 10:  # 10:1 imbalance
-                score += 10.0
-
-        return min(score, 100.0)
-
-    def _score_protocol_context(self, conn: Connection, duration: float) -> float:
-        """
-        Score based on protocol-specific expectations.
-
-        Some protocols should never be long-lived:
-        - DNS (should be instant)
-        - HTTP (unless streaming)
-        """
-        service = (conn.service or "").lower()
-        dst_port = conn.dst_port
-
-        score = 0.0
-
-        # DNS should be very short
-        if service == "dns" or dst_port == 53:
-            if duration > 60:  # More than 1 minute is very suspicious
-                score += 90.0
-            elif duration > 10:
-                score += 70.0
-            elif duration > 5:
-                score += 50.0
-
-        # HTTP/HTTPS long connections
-        elif service in ["http", "https"] or dst_port in [80, 443, 8080, 8443]:
-            if duration > 3600:  # 1 hour
-                score += 60.0
-            elif duration > 1800:  # 30 minutes
-                score += 40.0
-            elif duration > 900:  # 15 minutes
-                score += 20.0
-
-        # SSH with high data transfer
-        elif service == "ssh" or dst_port == 22:
-            bytes_sent = conn.bytes_sent or 0
-            if duration > 3600 and bytes_sent > 10 * 1024 * 1024:  # 1hr + 10MB
-                score += 50.0
-
-        # Non-standard ports
-        elif dst_port > 49152:  # Ephemeral/dynamic ports
-            score += 20.0
-
-        return min(score, 100.0)
-
-    def _score_destination(self, conn: Connection) -> float:
-        """
-        Score based on destination characteristics.
-
-        More suspicious:
-        - External IPs
-        - Unusual ports
-        - Multiple destination ports from same source
-        """
-        score = 0.0
-
-        # External destination
-        if not self._is_private_ip(conn.dst_ip):
-            score += 50.0
-
-        # Non-standard port
-        dst_port = conn.dst_port
-        standard_ports = {
-            20, 21, 22, 23, 25, 53, 80, 110, 143, 443,
-            3306, 3389, 5432, 8080, 8443
-        }
-        if dst_port not in standard_ports:
-            score += 30.0
-
-        # High-numbered port
-        if dst_port > 49152:
-            score += 20.0
-
-        return min(score, 100.0)
-
     def _is_private_ip(self, ip: str) -> bool:
         """Check if IP is in private range."""
-        try:
-            # Simple check for common private ranges
-            parts = [int(p) for p in ip.split(".")]
-            if len(parts) != 4:
-                return False
-
-            # 10.0.0.0/8
-            if parts[0] == 10:
-                return True
-            # 172.16.0.0/12
-            if parts[0] == 172 and 16 <= parts[1] <= 31:
-                return True
-            # 192.168.0.0/16
-            if parts[0] == 192 and parts[1] == 168:
-                return True
-            # 127.0.0.0/8
-            if parts[0] == 127:
-                return True
-
-            return False
-        except:
+        u = _ip_to_u32(ip)
+        if u is None:
             return False
+        return any((u & netmask) == network for network, netmask in PRIVATE_IP_NETWORKS)
 
     def _calculate_confidence(
         self,
         conn: Connection,
+        total_bytes: int,
         bytes_per_second: float,
     ) -> float:
         """Calculate confidence in the detection."""
         confidence = 0.6  # Base confidence
 
         # Higher confidence with more data
-        total_bytes = (conn.bytes_sent or 0) + (conn.bytes_recv or 0)
         if total_bytes >= 10 * 1024 * 1024:  # 10 MB
             confidence += 0.2
         elif total_bytes >= 1024 * 1024:  # 1 MB
@@ -419,6 +456,7 @@ class LongConnectionAnalyzer:
         self,
         conn: Connection,
         duration: float,
+        bytes_sent: int,
         bytes_per_second: float,
         duration_score: float,
         transfer_score: float,
@@ -438,7 +476,7 @@ class LongConnectionAnalyzer:
 
         # Transfer pattern
         if transfer_score >= 40:
-            upload_mb = (conn.bytes_sent or 0) / (1024 * 1024)
+            upload_mb = bytes_sent / (1024 * 1024)
             reasons.append(f"High data upload: {upload_mb:.1f} MB ({transfer_score:.0f} pts)")
         elif transfer_score >= 20:
             reasons.append(f"Sustained data transfer ({transfer_score:.0f} pts)")
@@ -502,84 +540,85 @@ class LongConnectionAnalyzer:
         bytes_recv: int,
         bytes_per_second: float,
     ) -> List[str]:
-        """Map long connection to MITRE ATT&CK techniques."""
+        """
+        Map long connection to MITRE ATT&CK techniques.
+
+        Each technique is checked once, in ascending id order, so the result
+        is already sorted and unique.
+        """
         techniques = []
 
+        # Scheduled/regular transfer
+        if bytes_per_second > 0 and duration > 1800:
+            techniques.append("T1029")  # Scheduled Transfer
+
+        # Low sustained transfer = covert channel
+        if 0 < bytes_per_second < 100 and duration > 1800:
+            techniques.append("T1030")  # Data Transfer Size Limits
+
         # High upload = exfiltration
         upload_rate = bytes_sent / duration if duration > 0 else 0
         if upload_rate >= 1024:  # 1 KB/s sustained
             techniques.append("T1041")  # Exfiltration Over C2 Channel
 
-        # Low sustained transfer = covert channel
-        if 0 < bytes_per_second < 100 and duration > 1800:
-            techniques.append("T1030")  # Data Transfer Size Limits
+        # Large transfer to external IP
+        if not self._is_private_ip(conn.dst_ip) and bytes_sent > 10 * 1024 * 1024:
+            techniques.append("T1048")  # Exfiltration Over Alternative Protocol
 
         # Long duration = persistent connection
         if duration > 3600:  # 1 hour
             techniques.append("T1071")  # Application Layer Protocol
 
             # Protocol-specific C2 techniques
-            service = (conn.service or "").lower()
-            if service in ["http", "https"] or conn.dst_port in [80, 443, 8080, 8443]:
+            service = conn.service_lc
+            if service in ("http", "https") or conn.dst_port in WEB_PORTS:
                 techniques.append("T1071.001")  # Web Protocols
             elif service == "dns" or conn.dst_port == 53:
                 techniques.append("T1071.004")  # DNS
 
-        # Scheduled/regular transfer
-        if bytes_per_second > 0 and duration > 1800:
-            techniques.append("T1029")  # Scheduled Transfer
-
-        # Large transfer to external IP
-        if not self._is_private_ip(conn.dst_ip) and bytes_sent > 10 * 1024 * 1024:
-            techniques.append("T1048")  # Exfiltration Over Alternative Protocol
-
-        return sorted(list(set(techniques)))
+        return techniques
 
     def _build_mitre_mappings(
         self,
         conn: Connection,
         technique_ids: List[str],
         confidence: float,
-        indicators: List[str],
+        duration: float,
+        bytes_sent: int,
+        bytes_recv: int,
     ) -> List[MitreMapping]:
-        """Build full MITRE mapping objects with evidence."""
+        """Build full MITRE mapping objects with evidence (missing byte counts read as 0)."""
         mappings = []
+        if not technique_ids:
+            return mappings
+
+        # Evidence depends only on the connection; each mapping gets its own copy
+        evidence = [
+            f"Long connection: {conn.src_ip}:{conn.src_port} → {conn.dst_ip}:{conn.dst_port}",
+            f"Duration: {duration:.0f} seconds",
+            f"Bytes sent: {bytes_sent:,}",
+            f"Bytes received: {bytes_recv:,}",
+        ]
+        if conn.service:
+            evidence.append(f"Service: {conn.service}")
+
+        # MitreMapping stores detection times as POSIX seconds
+        timestamp = conn.timestamp.timestamp()
 
         for tech_id in technique_ids:
-            technique = mitre_framework.get_technique(tech_id)
-            if not technique:
+            profile = _technique_profile(tech_id)
+            if profile is None:
                 continue
-
-            tactics = mitre_framework.get_tactics_for_technique(tech_id)
-            tactic = tactics[0] if tactics else None
-
-            evidence = [
-                f"Long connection: {conn.src_ip}:{conn.src_port} → {conn.dst_ip}:{conn.dst_port}",
-                f"Duration: {conn.duration:.0f} seconds",
-                f"Bytes sent: {conn.bytes_sent:,}",
-                f"Bytes received: {conn.bytes_recv:,}",
-            ]
-            if conn.service:
-                evidence.append(f"Service: {conn.service}")
-
-            observed_behaviors = []
-            if "T1041" in tech_id or "T1048" in tech_id:
-                observed_behaviors.append("Sustained outbound data transfer")
-            if "T1030" in tech_id:
-                observed_behaviors.append("Small consistent data transfers (covert channel)")
-            if "T1071" in tech_id:
-                observed_behaviors.append("Long-duration application layer connection")
-
-            timestamp = conn.timestamp or 0.0
+            technique_name, tactic_name, tactic_id, behaviors = profile
 
             mapping = MitreMapping(
                 technique_id=tech_id,
-                technique_name=technique.name,
-                tactic=tactic.name if tactic else "Unknown",
-                tactic_id=tactic.tactic_id if tactic else "Unknown",
+                technique_name=technique_name,
+                tactic=tactic_name,
+                tactic_id=tactic_id,
                 confidence=confidence,
-                evidence=evidence,
-                observed_behaviors=observed_behaviors,
+                evidence=list(evidence),
+                observed_behaviors=list(behaviors),
                 detection_count=1,
                 first_detected=timestamp,
                 last_detected=timestamp,
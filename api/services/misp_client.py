@@ -3,17 +3,36 @@ Minimal MISP client for IOC enrichment.
 """
 from __future__ import annotations
 
-import json
 import os
 from typing import Any
-from urllib import error, parse, request
+
+import httpx
+import orjson
 
 
 class MISPClient:
+    # Keep-alive connections held open for a batch of lookups
+    POOL_SIZE = 8
+
     def __init__(self) -> None:
         self.base_url = os.getenv("MISP_URL", "").rstrip("/")
         self.api_key = os.getenv("MISP_API_KEY", "")
         self.search_path = os.getenv("MISP_SEARCH_PATH", "/attributes/restSearch")
+        self._http: httpx.Client | None = None
+        # IOC values repeat within a case; each (value, limit) is only fetched once per client
+        self._results: dict[tuple[str, int], dict[str, Any]] = {}
+
+    def __enter__(self) -> "MISPClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
 
     @property
     def configured(self) -> bool:
@@ -26,28 +45,45 @@ class MISPClient:
             "Authorization": self.api_key,
         }
 
+    def _client(self) -> httpx.Client:
+        """Pooled HTTP client, so consecutive lookups reuse the TCP/TLS connection."""
+        if self._http is None:
+            self._http = httpx.Client(
+                headers=self._headers(),
+                timeout=20,
+                limits=httpx.Limits(max_connections=self.POOL_SIZE, max_keepalive_connections=self.POOL_SIZE),
+            )
+        return self._http
+
     def search_attribute(self, value: str, limit: int = 25) -> dict[str, Any]:
         if not self.configured:
             raise RuntimeError("MISP integration is not configured")
 
+        key = (value, limit)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}{self.search_path}"
         payload = {
             "returnFormat": "json",
             "value": value,
             "limit": limit,
         }
-        data = json.dumps(payload).encode("utf-8")
-        req = request.Request(url, data=data, headers=self._headers(), method="POST")
 
         try:
-            with request.urlopen(req, timeout=20) as resp:
-                raw = resp.read().decode("utf-8")
-                return json.loads(raw) if raw else {}
-        except error.HTTPError as e:
-            body = e.read().decode("utf-8", errors="ignore") if hasattr(e, "read") else str(e)
-            raise RuntimeError(f"MISP HTTP {e.code}: {body}") from e
+            resp = self._client().post(url, content=orjson.dumps(payload))
         except Exception as e:
             raise RuntimeError(f"MISP request failed: {e}") from e
+        if resp.status_code >= 400:
+            raise RuntimeError(f"MISP HTTP {resp.status_code}: {resp.text}")
+
+        try:
+            result = orjson.loads(resp.content) if resp.content else {}
+        except orjson.JSONDecodeError as e:
+            raise RuntimeError(f"MISP request failed: {e}") from e
+        self._results[key] = result
+        return result
 
 
 def normalize_misp_hits(payload: dict[str, Any]) -> tuple[int, list[dict[str, Any]]]:
@@ -58,19 +94,22 @@ def normalize_misp_hits(payload: dict[str, Any]) -> tuple[int, list[dict[str, An
     # {"response": {"Attribute": [...]}}
     # {"response": [{"Event": ...}, ...]}
     # {"Attribute": [...]} / {"Event": [...]}
-    items: list[dict[str, Any]] = []
-
-    response = payload.get("response")
-    if isinstance(response, dict):
-        if isinstance(response.get("Attribute"), list):
-            items = response["Attribute"]
-        elif isinstance(response.get("Event"), list):
-            items = response["Event"]
-    elif isinstance(response, list):
-        items = response
-    elif isinstance(payload.get("Attribute"), list):
-        items = payload["Attribute"]
-    elif isinstance(payload.get("Event"), list):
-        items = payload["Event"]
+    match payload:
+        case {"response": dict() as response}:
+            match response:
+                case {"Attribute": list() as items}:
+                    pass
+                case {"Event": list() as items}:
+                    pass
+                case _:
+                    items = []
+        case {"response": list() as items}:
+            pass
+        case {"Attribute": list() as items}:
+            pass
+        case {"Event": list() as items}:
+            pass
+        case _:
+            items = []
 
     return len(items), items
@@ -1,90 +1,126 @@
 """Packet-level inspection service for connection deep dives."""
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
 from datetime import datetime
-from typing import Any
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable
+
+import numpy as np
 
 from api.config import settings
+from api.parsers.unified import Connection
 from api.services.log_store import log_store
 from api.services.demo_data import DemoDataService
 
+# Protocol detail fields pulled from demo log rows once, when the uid indexes are built
+HttpFields = tuple[Any, Any, Any, Any, Any]  # method, uri, status, user_agent, content_type
+DnsFields = tuple[Any, Any, Any]  # query, response, ttl
+
+
+def _http_fields(row: dict[str, Any]) -> HttpFields:
+    return (
+        row.get("method"),
+        row.get("uri"),
+        row.get("status_code"),
+        row.get("user_agent"),
+        (row.get("resp_mime_types") or [None])[0],
+    )
+
+
+def _dns_fields(row: dict[str, Any]) -> DnsFields:
+    answers = row.get("answers")
+    return (
+        row.get("query"),
+        ", ".join(answers) if answers else row.get("rcode_name"),
+        (row.get("TTLs") or [None])[0],
+    )
+
+
+def _event_time(event: dict[str, Any]) -> float:
+    return event["timestamp"]
+
+
+class UidIndex:
+    """Rows grouped by connection uid: one list sorted by uid plus each uid's slice bounds."""
+
+    __slots__ = ("rows", "ranges")
+
+    def __init__(self, keyed: list[tuple[str, Any]]):
+        keyed.sort(key=itemgetter(0))  # stable, so each uid keeps its file order
+        self.rows = [item for _, item in keyed]
+        self.ranges: dict[str, tuple[int, int]] = {}
+        start = 0
+        for uid, group in groupby(keyed, key=itemgetter(0)):
+            stop = start + sum(1 for _ in group)
+            self.ranges[uid] = (start, stop)
+            start = stop
+
+    def get(self, uid: str) -> list[Any]:
+        start, stop = self.ranges.get(uid, (0, 0))
+        return self.rows[start:stop]
+
 
 class PacketInspector:
+    # Synthetic per-packet rows returned with a connection detail; packet_count carries the total
+    PACKET_PREVIEW_LIMIT = 256
+
     def __init__(self):
         self.demo = DemoDataService()
-        self._http_by_uid: dict[str, list[dict[str, Any]]] | None = None
-        self._dns_by_uid: dict[str, list[dict[str, Any]]] | None = None
-        self._notice_by_uid: dict[str, list[dict[str, Any]]] | None = None
+        self._http_by_uid: UidIndex | None = None  # HttpFields rows
+        self._dns_by_uid: UidIndex | None = None  # DnsFields rows
+        self._notice_by_uid: UidIndex | None = None  # raw notice.log rows
+        self._conn_by_uid: dict[str, Connection] | None = None
+        self._conn_version = -1
 
     def _ensure_indexes(self):
+        if self._conn_version != log_store.version:
+            # First occurrence wins for duplicate uids, as with a front-to-back scan
+            self._conn_by_uid = {c.uid: c for c in reversed(log_store.connections)}
+            self._conn_version = log_store.version
+
         if self._http_by_uid is not None:
             return
-        self._http_by_uid = defaultdict(list)
-        self._dns_by_uid = defaultdict(list)
-        self._notice_by_uid = defaultdict(list)
-
-        for row in self.demo.read_json_lines("http.log"):
-            uid = row.get("uid")
-            if uid:
-                self._http_by_uid[uid].append(row)
-
-        for row in self.demo.read_json_lines("dns.log"):
-            uid = row.get("uid")
-            if uid:
-                self._dns_by_uid[uid].append(row)
-
-        for row in self.demo.read_json_lines("notice.log"):
+        self._http_by_uid = self._index_by_uid("http.log", _http_fields)
+        self._dns_by_uid = self._index_by_uid("dns.log", _dns_fields)
+        self._notice_by_uid = self._index_by_uid("notice.log")
+
+    def _index_by_uid(
+        self, filename: str, extract: Callable[[dict[str, Any]], Any] | None = None
+    ) -> UidIndex:
+        """Group a demo log's rows (or the fields extracted from them) by connection uid while streaming the file."""
+        keyed = []
+        for row in self.demo.iter_json_lines(filename):
             uid = row.get("uid")
             if uid:
-                self._notice_by_uid[uid].append(row)
+                keyed.append((uid, extract(row) if extract else row))
+        return UidIndex(keyed)
 
     def get_connection_detail(self, uid: str) -> dict[str, Any] | None:
         self._ensure_indexes()
-        conn = next((c for c in log_store.connections if c.uid == uid), None)
+        conn = self._conn_by_uid.get(uid)
         if not conn:
             return None
 
-        http = (self._http_by_uid or {}).get(uid, [])
-        dns = (self._dns_by_uid or {}).get(uid, [])
-        notices = (self._notice_by_uid or {}).get(uid, [])
+        http = self._http_by_uid.get(uid)
+        dns = self._dns_by_uid.get(uid)
+        notices = self._notice_by_uid.get(uid)
 
         total_packets = (conn.pkts_sent or 0) + (conn.pkts_recv or 0)
         total_bytes = (conn.bytes_sent or 0) + (conn.bytes_recv or 0)
         avg_pkt = int(total_bytes / total_packets) if total_packets else 0
 
-        packets: list[dict[str, Any]] = []
-        for i in range(max(total_packets, 1)):
-            direction = "orig->resp" if i % 2 == 0 else "resp->orig"
-            size = avg_pkt if avg_pkt > 0 else (64 + (i % 3) * 32)
-            packets.append(
-                {
-                    "index": i + 1,
-                    "timestamp": conn.timestamp.timestamp() + (i * 0.01),
-                    "direction": direction,
-                    "size": size,
-                    "flags": conn.conn_state or "-",
-                }
-            )
+        packets = self._synthesize_packets(conn, min(max(total_packets, 1), self.PACKET_PREVIEW_LIMIT), avg_pkt)
 
         protocol_details: dict[str, Any] = {
             "http": [
-                {
-                    "method": h.get("method"),
-                    "uri": h.get("uri"),
-                    "status": h.get("status_code"),
-                    "user_agent": h.get("user_agent"),
-                    "content_type": (h.get("resp_mime_types") or [None])[0],
-                }
-                for h in http
+                {"method": method, "uri": uri, "status": status, "user_agent": user_agent, "content_type": content_type}
+                for method, uri, status, user_agent, content_type in http
             ],
             "dns": [
-                {
-                    "query": d.get("query"),
-                    "response": ", ".join(d.get("answers", [])) if d.get("answers") else d.get("rcode_name"),
-                    "ttl": (d.get("TTLs") or [None])[0],
-                }
-                for d in dns
+                {"query": query, "response": response, "ttl": ttl}
+                for query, response, ttl in dns
             ],
             "tls": [],
             "files": [],
@@ -107,10 +143,24 @@ class PacketInspector:
             "bytes_sent": conn.bytes_sent,
             "bytes_recv": conn.bytes_recv,
             "packets": packets,
+            "packet_count": total_packets,
             "protocol_details": protocol_details,
             "demo_mode": settings.demo_mode,
         }
 
+    @staticmethod
+    def _synthesize_packets(conn: Connection, count: int, avg_pkt: int) -> list[dict[str, Any]]:
+        """Alternating-direction packet rows spaced 10ms apart, sized from the connection average."""
+        idx = np.arange(count)
+        directions = np.where(idx % 2 == 0, "orig->resp", "resp->orig").tolist()
+        sizes = (np.full(count, avg_pkt) if avg_pkt > 0 else 64 + (idx % 3) * 32).tolist()
+        timestamps = (conn.timestamp.timestamp() + idx * 0.01).tolist()
+        flags = conn.conn_state or "-"
+        return [
+            {"index": i + 1, "timestamp": ts, "direction": direction, "size": size, "flags": flags}
+            for i, ts, direction, size in zip(range(count), timestamps, directions, sizes)
+        ]
+
     def get_flow(self, uid: str) -> list[dict[str, Any]] | None:
         detail = self.get_connection_detail(uid)
         if not detail:
@@ -145,29 +195,34 @@ class PacketInspector:
                 }
             )
 
-        for notice in detail["protocol_details"].get("notices", []):
-            events.append(
+        # Start, DNS and HTTP events sit at fixed increasing offsets and are already in
+        # order; only notices carry their own timestamps and need sorting
+        alerts = sorted(
+            (
                 {
                     "timestamp": notice.get("ts", detail["timestamp"] + 0.2),
                     "direction": "resp->orig",
                     "type": "alert",
                     "summary": notice.get("msg") or notice.get("note") or "Notice event",
                 }
-            )
-
-        events.append(
-            {
-                "timestamp": detail["timestamp"] + (detail.get("duration") or 0.3),
-                "direction": "resp->orig",
-                "type": "connection",
-                "summary": "Connection ended",
-            }
+                for notice in detail["protocol_details"].get("notices", [])
+            ),
+            key=_event_time,
         )
 
-        return sorted(events, key=lambda e: e["timestamp"])
+        end = {
+            "timestamp": detail["timestamp"] + (detail.get("duration") or 0.3),
+            "direction": "resp->orig",
+            "type": "connection",
+            "summary": "Connection ended",
+        }
+
+        # Ties keep the start/DNS/HTTP, notice, end order a stable sort would give
+        return list(heapq.merge(events, alerts, [end], key=_event_time))
 
     def get_payload_preview(self, uid: str) -> dict[str, Any] | None:
-        conn = next((c for c in log_store.connections if c.uid == uid), None)
+        self._ensure_indexes()
+        conn = self._conn_by_uid.get(uid)
         if not conn:
             return None
 
@@ -11,12 +11,12 @@ Generates comprehensive reports including:
 """
 import html
 import io
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional
 from uuid import uuid4
 
+import orjson
 from xhtml2pdf import pisa
 
 from api.services.log_store import LogStore
@@ -109,6 +109,10 @@ class ReportGenerator:
             },
         }
 
+    def generate_bytes(self) -> bytes:
+        """Generate the JSON report already serialized, for responses that skip re-encoding."""
+        return orjson.dumps(self.generate_json(), option=orjson.OPT_NON_STR_KEYS)
+
     def generate_html(self, data: Optional[Dict] = None) -> str:
         """Generate an HTML threat assessment report."""
         data = data or self.generate_json()
@@ -265,7 +269,7 @@ class ReportGenerator:
         pdf_path = self.reports_dir / pdf_filename
         metadata_path = self.reports_dir / metadata_filename
 
-        json_path.write_text(json.dumps(report_json, indent=2), encoding="utf-8")
+        json_path.write_bytes(orjson.dumps(report_json, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         html_path.write_text(report_html, encoding="utf-8")
         pdf_path.write_bytes(report_pdf)
 
@@ -284,7 +288,7 @@ class ReportGenerator:
             },
         }
 
-        metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+        metadata_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
         return metadata
 
     def list_reports(self) -> list[Dict]:
@@ -292,9 +296,9 @@ class ReportGenerator:
         reports: list[Dict] = []
         for meta_file in self.reports_dir.glob("*.meta.json"):
             try:
-                payload = json.loads(meta_file.read_text(encoding="utf-8"))
+                payload = orjson.loads(meta_file.read_bytes())
                 reports.append(payload)
-            except (json.JSONDecodeError, OSError):
+            except (orjson.JSONDecodeError, OSError):
                 continue
 
         reports.sort(key=lambda x: x.get("generated_at", ""), reverse=True)
@@ -305,7 +309,7 @@ class ReportGenerator:
         meta_path = self.reports_dir / f"{report_id}.meta.json"
         if not meta_path.exists():
             return None
-        return json.loads(meta_path.read_text(encoding="utf-8"))
+        return orjson.loads(meta_path.read_bytes())
 
     def delete_report(self, report_id: str) -> bool:
         """Delete saved report assets and metadata by ID."""
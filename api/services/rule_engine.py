@@ -2,13 +2,13 @@
 from __future__ import annotations
 
 import ipaddress
-import json
 import os
 import re
 from datetime import datetime, timezone
 from typing import Any, Literal
 from uuid import uuid4
 
+import orjson
 from pydantic import BaseModel, Field
 
 from api.services.log_store import log_store
@@ -77,21 +77,21 @@ class RuleEngine:
     def _ensure_file(self):
         os.makedirs(os.path.dirname(self.rules_file), exist_ok=True)
         if not os.path.exists(self.rules_file):
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump([], f, indent=2)
+            with open(self.rules_file, "wb") as f:
+                f.write(orjson.dumps([], option=orjson.OPT_INDENT_2))
 
     def _now(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
     def _load(self) -> list[RuleDefinition]:
         self._ensure_file()
-        with open(self.rules_file, "r", encoding="utf-8") as f:
-            data = json.load(f) or []
+        with open(self.rules_file, "rb") as f:
+            data = orjson.loads(f.read()) or []
         return [RuleDefinition(**r) for r in data]
 
     def _save(self, rules: list[RuleDefinition]):
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump([r.model_dump() for r in rules], f, indent=2)
+        with open(self.rules_file, "wb") as f:
+            f.write(orjson.dumps([r.model_dump() for r in rules], option=orjson.OPT_INDENT_2))
 
     def list_rules(self) -> list[RuleDefinition]:
         return self._load()
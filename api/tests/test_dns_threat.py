@@ -109,6 +109,16 @@ class TestDnsAnalyzer:
         score_random = analyzer._calculate_bigram_score("xqzwfk")
         assert score_random < 20.0
 
+    def test_lexical_features_match_individual_helpers(self, analyzer):
+        """Test fused lexical feature pass matches the per-feature helpers."""
+        for s in ["example", "xqzwfkjhgpmnb", "a1b2-c3d4", "AbC99", "x", ""]:
+            assert analyzer._calculate_lexical_features(s) == (
+                analyzer._calculate_entropy(s),
+                analyzer._calculate_bigram_score(s),
+                analyzer._calculate_consonant_ratio(s),
+                analyzer._calculate_digit_ratio(s),
+            )
+
     def test_dns_tunneling_detection_high_entropy_subdomains(self, analyzer, base_time):
         """Test detection of DNS tunneling with high-entropy subdomains."""
         queries = []
@@ -155,6 +165,43 @@ class TestDnsAnalyzer:
         assert result.txt_record_queries > 0
         assert "TXT record" in " ".join(result.reasons)
 
+    def test_qtype_and_rcode_normalized_to_uppercase(self, analyzer, base_time):
+        """Test that lowercase qtype/rcode values are canonicalized at ingest."""
+        queries = [
+            self.create_dns_query(
+                query=f"q{i}x7z{i}k9.exfil.com",
+                src_ip="192.168.1.103",
+                qtype="txt",
+                rcode="nxdomain",
+                timestamp=base_time + timedelta(seconds=i * 10),
+            )
+            for i in range(10)
+        ]
+
+        assert queries[0].qtype == "TXT"
+        assert queries[0].rcode == "NXDOMAIN"
+        assert self.create_dns_query(query="x.com", rcode="3").rcode == "NXDOMAIN"
+
+        result = analyzer._analyze_tunneling_pattern("192.168.1.103", "exfil.com", queries)
+        assert result.txt_record_queries == 10
+        assert result.nxdomain_responses == 10
+        assert result.unusual_query_types == []
+
+    def test_query_epoch_matches_timestamp(self, base_time):
+        """Test that epoch and query_lc follow their fields and stay out of dumps and equality."""
+        query = self.create_dns_query(query="Example.COM", timestamp=base_time)
+
+        assert query.epoch == base_time.timestamp()
+        assert query.query_lc == "example.com"
+        assert "epoch" not in query.model_dump()
+        assert "query_lc" not in query.model_dump()
+        assert "epoch" not in dict(query)
+        assert query == self.create_dns_query(query="Example.COM", timestamp=base_time)
+
+        later = base_time + timedelta(hours=1)
+        assert query.model_copy(update={"timestamp": later}).epoch == later.timestamp()
+        assert query.model_copy(update={"query": "bar.org"}).query_lc == "bar.org"
+
     def test_dns_tunneling_detection_long_subdomains(self, analyzer, base_time):
         """Test detection of DNS tunneling with very long subdomains."""
         queries = []
@@ -176,6 +223,49 @@ class TestDnsAnalyzer:
         assert result.avg_subdomain_length > 30
         assert "long subdomain" in " ".join(result.reasons).lower()
 
+    def test_tunneling_early_exit_below_min_score(self, analyzer, base_time):
+        """Test that groups which cannot reach min_score skip full analysis."""
+        queries = [
+            self.create_dns_query(
+                query=f"www{i % 2}.example.com",
+                src_ip="10.0.0.7",
+                timestamp=base_time + timedelta(seconds=i * 30),
+            )
+            for i in range(10)
+        ]
+
+        full = analyzer._analyze_tunneling_pattern("10.0.0.7", "example.com", queries)
+        assert full is not None
+        assert full.tunneling_score < 60.0
+
+        pruned = analyzer._analyze_tunneling_pattern(
+            "10.0.0.7", "example.com", queries, min_score=full.tunneling_score + 40.0
+        )
+        assert pruned is None
+
+    def test_dga_early_exit_skips_lexical_features(self, analyzer, base_time, monkeypatch):
+        """Test that DGA groups bounded out by cheap features skip entropy/bigram scoring."""
+        queries = [
+            self.create_dns_query(
+                query="google.com",
+                src_ip="10.0.0.8",
+                timestamp=base_time + timedelta(seconds=i * 30),
+            )
+            for i in range(5)
+        ]
+
+        full = analyzer._analyze_dga_domain("10.0.0.8", "google.com", queries)
+        assert full is not None
+        assert analyzer._analyze_dga_domain(
+            "10.0.0.8", "google.com", queries, min_score=full.dga_score
+        ) == full
+
+        def fail(s):
+            raise AssertionError("lexical features computed for a bounded-out group")
+
+        monkeypatch.setattr(analyzer, "_calculate_lexical_features", fail)
+        assert analyzer._analyze_dga_domain("10.0.0.8", "google.com", queries, min_score=65.0) is None
+
     def test_dga_detection_high_entropy_domain(self, analyzer, base_time):
         """Test detection of DGA domain with high entropy."""
         queries = []
@@ -403,6 +493,25 @@ class TestDnsAnalyzer:
         assert summary.dga_detections > 0
         assert summary.fast_flux_detections > 0
 
+    def test_analysis_accepts_iterator(self, analyzer, base_time):
+        """Test that analyze_dns_threats consumes a one-shot iterator."""
+        queries = [
+            self.create_dns_query(
+                query=f"a1b2c3d4e5f6g7h8{i}.evil-c2.com",
+                src_ip="10.0.1.9",
+                timestamp=base_time + timedelta(seconds=i * 30),
+            )
+            for i in range(15)
+        ]
+
+        from_list = analyzer.analyze_dns_threats(queries)
+        from_iter = analyzer.analyze_dns_threats(q for q in queries)
+
+        assert from_iter.total_queries_analyzed == len(queries)
+        assert from_iter.tunneling_detections == from_list.tunneling_detections
+        assert from_iter.data_time_range_start == from_list.data_time_range_start
+        assert from_iter.data_time_range_end == from_list.data_time_range_end
+
     def test_no_threats_legitimate_traffic(self, analyzer, base_time):
         """Test that legitimate DNS traffic doesn't trigger false positives."""
         queries = []
@@ -0,0 +1,51 @@
+"""Tests for the HTTP anomaly analyzer."""
+from api.services.http_analyzer import HttpAnalyzer, HttpSession
+
+
+def _session(**overrides) -> HttpSession:
+    fields = {
+        "uid": "C1",
+        "ts": "2024-01-15T10:00:00",
+        "src_ip": "192.168.1.10",
+        "src_port": 50000,
+        "dst_ip": "203.0.113.5",
+        "dst_port": 80,
+        "method": "GET",
+        "uri": "/index.html",
+        "user_agent": "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+        "status_code": 200,
+        "request_body_len": 0,
+        "response_body_len": 512,
+    }
+    fields.update(overrides)
+    return HttpSession(**fields)
+
+
+class TestHttpAnalyzer:
+    def test_clean_session(self):
+        [session] = HttpAnalyzer().analyze([_session()])
+        assert session.score == "clean"
+        assert session.anomalies == [] and session.mitre == []
+
+    def test_malicious_session_keeps_suspicious_uri_finding(self):
+        # User-agent, method and traversal already make the session malicious;
+        # the suspicious-URI finding and its T1190 tag are still reported
+        session = _session(method="put", uri="/admin/../../etc/passwd", user_agent="sqlmap/1.7")
+        [session] = HttpAnalyzer().analyze([session])
+
+        assert session.score == "malicious"
+        assert session.anomalies == [
+            "Suspicious user-agent: sqlmap/1.7",
+            "Unusual HTTP method: PUT",
+            "Directory traversal attempt: ../",
+            "Suspicious URI pattern: /admin",
+        ]
+        assert "T1190 - Exploit Public-Facing Application" in session.mitre
+
+    def test_reanalysis_resets_findings(self):
+        analyzer = HttpAnalyzer()
+        session = _session(uri="/.env")
+        analyzer.analyze([session])
+        analyzer.analyze([session])
+        assert session.anomalies == ["Suspicious URI pattern: /.env"]
+        assert session.score == "suspicious"
@@ -0,0 +1,92 @@
+"""Tests for hunt hypotheses service."""
+import json
+import os
+
+import pytest
+
+from api.services.hunt_hypotheses import HuntHypothesesService
+
+
+class TestHuntHypothesesService:
+    def test_list_seeds_templates(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        items = service.list_all()
+        assert len(items) == 5
+        assert {item["status"] for item in service.list_all(status="active")} == {"active"}
+
+    def test_index_tracks_create_update_delete(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        created = service.create({"title": "Test hunt", "steps": [{"description": "look"}]})
+        service.update(created["id"], {"title": "Renamed"})
+
+        index = json.loads(service.index_path.read_text(encoding="utf-8"))
+        assert index[created["id"]]["title"] == "Renamed"
+        assert [item["title"] for item in service.list_all()] == ["Renamed"]
+
+        service.delete(created["id"])
+        assert created["id"] not in json.loads(service.index_path.read_text(encoding="utf-8"))
+
+    def test_missing_index_rebuilt_from_files(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        created = service.create({"title": "Test hunt"})
+        service.index_path.unlink()
+
+        items = HuntHypothesesService(hypotheses_dir=tmp_path).list_all()
+        assert [item["id"] for item in items] == [created["id"]]
+
+    def test_stale_index_rebuilt_from_files(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        kept = service.create({"title": "Kept"})
+        removed = service.create({"title": "Removed"})
+        added = dict(kept, id="added", title="Added")
+
+        # Another process adds and removes files without touching the index
+        (tmp_path / "added.json").write_text(json.dumps(added), encoding="utf-8")
+        os.unlink(service._hypothesis_path(removed["id"]))
+        # Keep the test independent of the filesystem's timestamp granularity
+        index_mtime = os.stat(service.index_path).st_mtime_ns
+        os.utime(tmp_path, ns=(index_mtime + 10**9, index_mtime + 10**9))
+
+        titles = {item["title"] for item in HuntHypothesesService(hypotheses_dir=tmp_path).list_all()}
+        assert titles == {"Kept", "Added"}
+
+    def test_writes_leave_no_temp_files(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        created = service.create({"title": "Test hunt"})
+        service.update(created["id"], {"title": "Renamed"})
+
+        assert not list(tmp_path.glob("*.tmp")) and not list(tmp_path.glob(".*.tmp"))
+        assert [item["title"] for item in service.list_all()] == ["Renamed"]
+
+    def test_templates_seeded_once(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        for item in service.list_all():
+            service.delete(item["id"])
+
+        assert service.list_all() == []
+        assert HuntHypothesesService(hypotheses_dir=tmp_path).list_all() == []
+
+    def test_missing_hypothesis_raises_not_found(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        with pytest.raises(FileNotFoundError, match="Hypothesis not found: missing"):
+            service.get("missing")
+        with pytest.raises(FileNotFoundError, match="Hypothesis not found: missing"):
+            service.delete("missing")
+
+    def test_failed_update_does_not_leak_into_reads(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        created = service.create({"title": "Test hunt"})
+
+        with pytest.raises(ValueError):
+            service.update(created["id"], {"title": "Renamed", "status": "bogus"})
+
+        assert service.get(created["id"])["title"] == "Test hunt"
+
+    def test_reads_follow_files_changed_on_disk(self, tmp_path):
+        service = HuntHypothesesService(hypotheses_dir=tmp_path)
+        created = service.create({"title": "Test hunt"})
+        assert service.get(created["id"])["title"] == "Test hunt"
+
+        # Another service instance (e.g. another worker) rewrites the same store
+        HuntHypothesesService(hypotheses_dir=tmp_path).update(created["id"], {"title": "Renamed"})
+        assert service.get(created["id"])["title"] == "Renamed"
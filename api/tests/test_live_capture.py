@@ -1,8 +1,17 @@
 """Tests for live capture service."""
+import struct
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-from api.services.live_capture import LiveCaptureService, CaptureSession
+from api.services.live_capture import LiveCaptureService, CaptureSession, _count_packets
+
+
+def _write_pcap(path, payload_lens, byte_order="<", truncate=0):
+    data = struct.pack(byte_order + "IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1)
+    for n in payload_lens:
+        data += struct.pack(byte_order + "IIII", 1700000000, 0, n, n) + b"\x00" * n
+    path.write_bytes(data[:len(data) - truncate])
 
 
 class TestCaptureSession:
@@ -65,3 +74,55 @@ class TestCaptureService:
         assert isinstance(interfaces, list)
         assert len(interfaces) == 2
         assert interfaces[0]["name"] == "eth0"
+
+    @patch("api.services.live_capture.os.statvfs")
+    def test_capture_root_falls_back_when_shm_small(self, mock_statvfs):
+        mock_statvfs.return_value = MagicMock(f_bavail=16384, f_frsize=4096)  # 64 MiB free
+        assert LiveCaptureService()._capture_root() is None
+
+    @patch("api.services.live_capture.os.statvfs", side_effect=FileNotFoundError)
+    def test_capture_root_falls_back_without_shm(self, mock_statvfs):
+        assert LiveCaptureService()._capture_root() is None
+
+    @patch("api.services.live_capture.subprocess.Popen")
+    def test_list_sessions_polls_only_running(self, mock_popen):
+        proc = MagicMock(pid=1234)
+        proc.poll.return_value = None
+        mock_popen.return_value = proc
+        service = LiveCaptureService()
+        session = service.start_capture(interface="eth0", max_seconds=0)
+
+        assert service.list_sessions()[0].status == "running"
+
+        proc.poll.return_value = 0
+        assert service.list_sessions()[0].status == "stopped"
+        polls = proc.poll.call_count
+
+        service.list_sessions()
+        assert proc.poll.call_count == polls
+        assert service.get_session(session.session_id).status == "stopped"
+
+
+class TestCountPackets:
+    def test_counts_records(self, tmp_path):
+        path = tmp_path / "cap.pcap"
+        _write_pcap(path, [60, 1514, 0, 42])
+        assert _count_packets(str(path)) == 4
+
+    def test_big_endian(self, tmp_path):
+        path = tmp_path / "cap.pcap"
+        _write_pcap(path, [60, 60], byte_order=">")
+        assert _count_packets(str(path)) == 2
+
+    def test_truncated_last_record_ignored(self, tmp_path):
+        path = tmp_path / "cap.pcap"
+        _write_pcap(path, [60, 60, 60], truncate=10)
+        assert _count_packets(str(path)) == 2
+
+    def test_empty_and_unknown_format(self, tmp_path):
+        empty = tmp_path / "empty.pcap"
+        empty.write_bytes(b"")
+        pcapng = tmp_path / "cap.pcapng"
+        pcapng.write_bytes(b"\x0a\x0d\x0d\x0a" + b"\x00" * 60)
+        assert _count_packets(str(empty)) == 0
+        assert _count_packets(str(pcapng)) == 0
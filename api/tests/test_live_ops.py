@@ -1,6 +1,8 @@
 """Tests for live operations endpoints."""
+import random
+
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 from api.services.live_ops import LiveOpsService, SourceStats, LiveOpsState
@@ -26,6 +28,18 @@ class TestLiveOpsService:
         assert status["total_events_ingested"] == 10
         assert status["zeek"]["last_ingest_at"] is not None
     
+    def test_status_timestamps_follow_new_ingest(self):
+        """Test that cached ISO timestamps refresh when a new ingest is recorded."""
+        first = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.service._state.zeek_stats.last_ingest_at = first
+        assert self.service.get_status()["zeek"]["last_ingest_at"] == first.isoformat()
+        assert self.service.get_status()["zeek"]["last_ingest_at"] == first.isoformat()
+
+        self.service.record_zeek_ingest(1, 10, 0)
+        status = self.service.get_status()
+        assert status["zeek"]["last_ingest_at"] != first.isoformat()
+        assert status["zeek"]["last_ingest_at"] == status["last_event_at"]
+    
     def test_record_suricata_ingest_updates_stats(self):
         """Test that Suricata ingest updates stats correctly."""
         self.service.record_suricata_ingest(5, 500, 1)
@@ -104,7 +118,49 @@ class TestLiveOpsService:
         
         events = self.service.get_recent_events(limit=10)
         assert len(events) == 10
+
+    def test_recent_events_evict_oldest_beyond_cap(self):
+        """Test that the buffer keeps only the newest events, newest first."""
+        cap = self.service._max_recent_events
+        for i in range(cap + 5):
+            self.service.add_recent_event({"id": f"event-{i}", "timestamp": datetime.now(timezone.utc)})
+
+        events = self.service.get_recent_events(limit=cap + 5)
+        assert len(events) == cap
+        assert events[0]["id"] == f"event-{cap + 4}"
+        assert events[-1]["id"] == "event-5"
     
+    def test_since_filter_matches_full_scan(self):
+        """Test that `since` matches a plain scan with out-of-order and missing timestamps."""
+        rng = random.Random(7)
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        cap = self.service._max_recent_events
+        added = []
+        for i in range(2 * cap + 500):
+            ts = None if rng.random() < 0.1 else base + timedelta(seconds=rng.randint(0, 3600))
+            event = {"id": f"event-{i}", "timestamp": ts}
+            added.append(event)
+            self.service.add_recent_event(event)
+
+        buffered = added[-cap:]
+        for offset in (-1, 0, 900, 1800, 3599, 3600):
+            since = base + timedelta(seconds=offset)
+            expected = [e for e in buffered if e["timestamp"] and e["timestamp"] > since][::-1]
+            assert self.service.get_recent_events(since=since, limit=cap) == expected
+            assert self.service.get_recent_events(since=since, limit=10) == expected[:10]
+
+    def test_since_filter_skips_events_without_timestamp(self):
+        """Test that events without a timestamp never match `since` nor hide later ones."""
+        since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.service.add_recent_event({"id": "none-first", "timestamp": None})
+        self.service.add_recent_event({"id": "late", "timestamp": since + timedelta(hours=1)})
+        self.service.add_recent_event({"id": "missing"})
+        self.service.add_recent_event({"id": "early", "timestamp": since - timedelta(hours=1)})
+
+        events = self.service.get_recent_events(since=since, limit=10)
+        assert [e["id"] for e in events] == ["late"]
+        assert len(self.service.get_recent_events(limit=10)) == 4
+
     def test_reset_clears_state(self):
         """Test that reset clears all state."""
         self.service.record_zeek_ingest(10, 1000, 0)
@@ -387,5 +387,45 @@ class TestLongConnectionAnalyzer:
         assert all(r.score >= 60.0 for r in results)
 
 
+    @pytest.mark.parametrize(
+        "service,dst_ip,dst_port,duration,bytes_sent,bytes_recv,expected",
+        [
+            # 3x the https threshold, 1 KB/s upload, web context, external + standard port
+            ("https", "8.8.8.8", 443, 1000.0, 1024 * 1000, 0, (60.0, 10.0, 20.0, 50.0)),
+            # Long DNS with no byte counts, internal ephemeral destination
+            ("dns", "10.0.0.5", 50000, 120.0, None, None, (100.0, 0.0, 90.0, 50.0)),
+            # Quiet covert-channel style SSH session, 10:1 imbalance
+            ("ssh", "192.168.1.5", 22, 4000.0, 20000, 2000, (20.0, 40.0, 0.0, 0.0)),
+        ],
+    )
+    def test_component_scores(self, service, dst_ip, dst_port, duration, bytes_sent, bytes_recv, expected):
+        """Column-wise component scores follow the documented scoring rules."""
+        conn = Connection(
+            uid="C1", src_ip="192.168.1.100", src_port=54321, dst_ip=dst_ip, dst_port=dst_port,
+            proto="tcp", service=service, duration=duration, bytes_sent=bytes_sent,
+            bytes_recv=bytes_recv, timestamp=1704000000.0, source="zeek",
+        )
+
+        components = LongConnectionAnalyzer()._score_candidates([conn])
+
+        assert tuple(float(c[0]) for c in components) == expected
+
+
+    def test_mitre_evidence_with_missing_byte_counts(self):
+        """Connections whose byte counts Zeek logged as '-' still get MITRE evidence."""
+        conn = Connection(
+            uid="C1", src_ip="192.168.1.100", src_port=54321, dst_ip="8.8.8.8", dst_port=443,
+            proto="tcp", service="https", duration=7200.0, bytes_sent=None, bytes_recv=None,
+            timestamp=1704000000.0, source="zeek",
+        )
+
+        results = LongConnectionAnalyzer(min_score_threshold=0.0).analyze_connections([conn])
+
+        mappings = results[0].mitre_mappings
+        assert [m.technique_id for m in mappings] == ["T1071", "T1071.001"]
+        assert "Bytes sent: 0" in mappings[0].evidence
+        assert mappings[0].first_detected == 1704000000.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,67 @@
+"""Tests for the MISP enrichment client."""
+import httpx
+import orjson
+import pytest
+
+from api.services.misp_client import MISPClient, normalize_misp_hits
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("MISP_URL", "https://misp.example/")
+    monkeypatch.setenv("MISP_API_KEY", "secret")
+    return MISPClient()
+
+
+def _mock(client: MISPClient, handler) -> list[httpx.Request]:
+    seen: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return handler(request)
+
+    client._http = httpx.Client(headers=client._headers(), transport=httpx.MockTransport(record))
+    return seen
+
+
+class TestMISPClient:
+    def test_repeated_lookups_hit_server_once(self, client):
+        seen = _mock(client, lambda r: httpx.Response(200, json={"response": {"Attribute": [{"value": "1.2.3.4"}]}}))
+        with client:
+            first = client.search_attribute("1.2.3.4", limit=5)
+            second = client.search_attribute("1.2.3.4", limit=5)
+            client.search_attribute("1.2.3.4", limit=10)
+
+        assert first == second
+        assert normalize_misp_hits(first)[0] == 1
+        assert len(seen) == 2
+        assert str(seen[0].url) == "https://misp.example/attributes/restSearch"
+        assert seen[0].headers["Authorization"] == "secret"
+        assert orjson.loads(seen[0].content) == {"returnFormat": "json", "value": "1.2.3.4", "limit": 5}
+        assert client._http is None
+
+    def test_http_error_raises_runtime_error(self, client):
+        _mock(client, lambda r: httpx.Response(403, text="forbidden"))
+        with pytest.raises(RuntimeError, match="MISP HTTP 403: forbidden"):
+            client.search_attribute("evil.example")
+
+    def test_empty_body_is_empty_result(self, client):
+        _mock(client, lambda r: httpx.Response(200))
+        assert client.search_attribute("evil.example") == {}
+
+
+class TestNormalizeMispHits:
+    @pytest.mark.parametrize(
+        "payload, expected",
+        [
+            ({"response": {"Attribute": [{"id": 1}]}}, [{"id": 1}]),
+            ({"response": {"Event": [{"id": 2}]}}, [{"id": 2}]),
+            ({"response": {"Attribute": "bad"}, "Attribute": [{"id": 3}]}, []),
+            ({"response": [{"Event": {}}]}, [{"Event": {}}]),
+            ({"response": None, "Attribute": [{"id": 4}]}, [{"id": 4}]),
+            ({"Event": [{"id": 5}]}, [{"id": 5}]),
+            ({}, []),
+        ],
+    )
+    def test_response_shapes(self, payload, expected):
+        assert normalize_misp_hits(payload) == (len(expected), expected)
@@ -22,3 +22,29 @@ def test_flow_and_payload():
     assert flow is not None and len(flow) >= 2
     assert payload is not None
     assert "preview" in payload
+
+
+def test_packet_detail_tracks_store_reload():
+    uid = log_store.connections[0].uid
+    assert packet_inspector.get_connection_detail(uid) is not None
+
+    log_store.clear()
+    assert packet_inspector.get_connection_detail(uid) is None
+    assert packet_inspector.get_payload_preview(uid) is None
+
+    DemoDataService().load_into_store(log_store)
+    assert packet_inspector.get_connection_detail(uid)["uid"] == uid
+
+
+def test_packet_preview_is_capped():
+    conn = max(log_store.connections, key=lambda c: (c.pkts_sent or 0) + (c.pkts_recv or 0))
+    original = (conn.pkts_sent, conn.pkts_recv)
+    conn.pkts_sent, conn.pkts_recv = 1_000_000, 1_000_000
+    try:
+        detail = packet_inspector.get_connection_detail(conn.uid)
+    finally:
+        conn.pkts_sent, conn.pkts_recv = original
+    assert detail["packet_count"] == 2_000_000
+    assert len(detail["packets"]) == packet_inspector.PACKET_PREVIEW_LIMIT
+    assert [p["direction"] for p in detail["packets"][:2]] == ["orig->resp", "resp->orig"]
+    assert detail["packets"][-1]["index"] == packet_inspector.PACKET_PREVIEW_LIMIT
@@ -6,6 +6,8 @@ import pytest
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+
 from api.parsers.zeek_parser import ZeekParser
 from api.parsers.suricata_parser import SuricataParser
 from api.parsers.unified import (
@@ -255,6 +257,10 @@ class TestUnifiedModels:
         assert normalized.proto == first.proto.lower()
         assert normalized.source == "zeek"
         assert isinstance(normalized.timestamp, datetime)
+        assert normalized.service_lc == (first.service or "").lower()
+        assert "service_lc" not in normalized.model_dump()
+        assert "service_lc" not in dict(normalized)
+        assert normalized.model_copy(update={"service": "SSH"}).service_lc == "ssh"
 
     def test_normalize_zeek_dns(self):
         """Test normalizing Zeek DNS to unified model."""
@@ -336,6 +342,102 @@ class TestIntegration:
             filtered = store.get_connections(src_ip=test_ip)
             assert all(c.src_ip == test_ip for c in filtered)
 
+    def test_parallel_parse_matches_sequential(self, monkeypatch):
+        """Chunked parallel parsing loads the same records in the same order."""
+        if not FIXTURES_DIR.exists():
+            pytest.skip(f"Fixtures directory not found: {FIXTURES_DIR}")
+
+        from api.services.log_store import LogStore
+
+        sequential = LogStore()
+        sequential.load_directory(FIXTURES_DIR)
+
+        monkeypatch.setattr(LogStore, "PARALLEL_PARSE_MIN_BYTES", 0)
+        monkeypatch.setattr(LogStore, "PARSE_WORKERS", 3)
+        parallel = LogStore()
+        parallel.load_directory(FIXTURES_DIR)
+
+        assert parallel.connections == sequential.connections
+        assert parallel.dns_queries == sequential.dns_queries
+        assert parallel.alerts == sequential.alerts
+        assert parallel._src_ip_index == sequential._src_ip_index
+
+    def test_combined_filters_match_scan(self):
+        """Vectorized connection filters agree with a plain scan and see new rows."""
+        if not CONN_LOG.exists():
+            pytest.skip(f"Fixture not found: {CONN_LOG}")
+
+        from api.services.log_store import LogStore
+
+        store = LogStore()
+        store.load_directory(FIXTURES_DIR)
+        first = store.connections[0]
+
+        filtered = store.get_connections(proto="TCP", min_duration=0.5, time_start=first.timestamp)
+        expected = [
+            c for c in store.connections
+            if c.proto == "tcp" and c.duration and c.duration >= 0.5 and c.timestamp >= first.timestamp
+        ]
+        assert filtered == expected
+
+        before = len(store.get_connections(src_ip=first.src_ip, port=first.dst_port))
+        store._add_connection(first.model_copy())
+        assert len(store.get_connections(src_ip=first.src_ip, port=first.dst_port)) == before + 1
+
+
+    def test_appended_connections_extend_filter_columns(self):
+        """Rows added after a filtered query (in or out of time order) are seen by the next one."""
+        from datetime import timedelta, timezone
+
+        from api.parsers.unified import Connection
+        from api.services.log_store import LogStore
+
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        def conn(i: int, offset: int) -> Connection:
+            return Connection(
+                uid=f"C{i}", src_ip="10.0.0.1", src_port=40000 + i, dst_ip="10.0.0.2",
+                dst_port=443 if i % 2 else 80, proto="tcp" if i % 3 else "udp",
+                duration=float(i), timestamp=base + timedelta(seconds=offset), source="zeek",
+            )
+
+        store = LogStore()
+        store._extend_connections([conn(i, i * 10) for i in range(10)])
+        store.get_connections(proto="tcp", time_start=base)
+
+        # In-order tail, then rows older than everything stored, including a tie
+        for i, offset in enumerate([200, 210, 5, 0, 90], start=10):
+            store._add_connection(conn(i, offset))
+            window = (base + timedelta(seconds=5), base + timedelta(seconds=205))
+            got = store.get_connections(proto="tcp", time_start=window[0], time_end=window[1])
+            expected = [
+                c for c in store.connections
+                if c.proto == "tcp" and window[0] <= c.timestamp <= window[1]
+            ]
+            assert got == expected
+
+        fresh = LogStore()
+        fresh._extend_connections(store.connections)
+        fresh._connection_columns()
+        for name, column in store._connection_columns().items():
+            assert np.array_equal(column, fresh._conn_columns[name], equal_nan=True), name
+
+    def test_naive_time_filter_is_utc(self):
+        """Naive time_start/time_end are read as UTC like the parsed timestamps."""
+        from datetime import timezone
+
+        from api.parsers.unified import Connection
+        from api.services.log_store import LogStore
+
+        store = LogStore()
+        store._add_connection(Connection(
+            uid="C1", src_ip="10.0.0.1", src_port=1, dst_ip="10.0.0.2", dst_port=2, proto="tcp",
+            timestamp=datetime(2024, 1, 1, 12, tzinfo=timezone.utc), source="zeek",
+        ))
+
+        assert len(store.get_connections(time_start=datetime(2024, 1, 1, 12))) == 1
+        assert store.get_connections(time_start=datetime(2024, 1, 1, 12, 0, 1)) == []
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])